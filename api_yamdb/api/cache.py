@@ -0,0 +1,62 @@
+"""Response cache of the read-mostly catalogue endpoints."""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+HITS_KEY = "response-cache:hits"
+MISSES_KEY = "response-cache:misses"
+
+
+def get_cache():
+    return caches[settings.API_RESPONSE_CACHE]
+
+
+def get_generation(group):
+    """Return the current generation of cached responses of the group.
+
+    A missing generation starts from the current time, so responses cached
+    before its eviction can't be served again.
+    """
+    cache = get_cache()
+    key = f"response-cache:generation:{group}"
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns())
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate(*groups):
+    """Drop cached responses of the groups by bumping their generation."""
+    cache = get_cache()
+    for group in groups:
+        key = f"response-cache:generation:{group}"
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns())
+
+
+def get_key(group, request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"response-cache:{group}:{get_generation(group)}:{path}"
+
+
+def count(key):
+    cache = get_cache()
+    try:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+    except ValueError:
+        pass
+
+
+def get_stats():
+    cache = get_cache()
+    return {
+        "hits": cache.get(HITS_KEY, 0),
+        "misses": cache.get(MISSES_KEY, 0),
+    }
@@ -0,0 +1,108 @@
+"""In-memory histograms of the requests, exported in Prometheus format."""
+
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Methods used as labels, others are 'other': labels come from clients,
+# so their set must be bounded.
+METHODS = frozenset(
+    ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+)
+
+METRICS = OrderedDict(
+    (
+        (
+            "api_request_duration_seconds",
+            ("Wall time of the request.", DURATION_BUCKETS),
+        ),
+        (
+            "api_request_db_duration_seconds",
+            ("Time of the database queries of the request.", DURATION_BUCKETS),
+        ),
+        (
+            "api_request_serialization_seconds",
+            ("Time of rendering the response body.", DURATION_BUCKETS),
+        ),
+        (
+            "api_request_db_queries",
+            ("Number of the database queries of the request.", QUERY_BUCKETS),
+        ),
+    )
+)
+
+
+def get_method_label(method):
+    return method if method in METHODS else "other"
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        total = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            yield bound, total
+
+
+class Registry:
+    """Histograms of every metric per route name and method."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, route, method, values):
+        with self._lock:
+            for metric, value in values.items():
+                key = (metric, route, method)
+                if key not in self._histograms:
+                    self._histograms[key] = Histogram(METRICS[metric][1])
+                self._histograms[key].observe(value)
+
+    def clear(self):
+        with self._lock:
+            self._histograms = {}
+
+    def export(self):
+        """Return the histograms in Prometheus text format."""
+        lines = []
+        with self._lock:
+            for metric, (description, _) in METRICS.items():
+                lines.append(f"# HELP {metric} {description}")
+                lines.append(f"# TYPE {metric} histogram")
+                for (name, route, method), histogram in sorted(
+                    self._histograms.items()
+                ):
+                    if name != metric:
+                        continue
+                    labels = f'route="{route}",method="{method}"'
+                    for bound, count in histogram.cumulative_counts():
+                        lines.append(
+                            f'{metric}_bucket{{{labels},le="{bound}"}} {count}'
+                        )
+                    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(
+                        f"{metric}_count{{{labels}}} {histogram.count}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
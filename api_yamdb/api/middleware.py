@@ -0,0 +1,135 @@
+"""Custom middlewares."""
+
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from api.metrics import get_method_label, registry
+from api.routers import set_read_alias
+from api.v1.authentication import CachedJWTAuthentication
+
+
+class QueryMetricsMiddleware:
+    """Record queries, database time, rendering time and wall time.
+
+    Values are observed per resolved route name (e.g. 'titles-list') and
+    method. Queries are counted by execute wrappers of the connections,
+    so it works without DEBUG.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._metrics = {"queries": 0, "db": 0.0, "render": 0.0}
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(self.get_query_wrapper(request))
+                )
+            response = self.get_response(request)
+        match = request.resolver_match
+        registry.observe(
+            match.url_name if match and match.url_name else "unmatched",
+            get_method_label(request.method),
+            {
+                "api_request_duration_seconds": time.perf_counter() - start,
+                "api_request_db_duration_seconds": request._metrics["db"],
+                "api_request_serialization_seconds": (
+                    request._metrics["render"]
+                ),
+                "api_request_db_queries": request._metrics["queries"],
+            },
+        )
+        return response
+
+    def get_query_wrapper(self, request):
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                request._metrics["queries"] += 1
+                request._metrics["db"] += time.perf_counter() - start
+
+        return wrapper
+
+    def process_template_response(self, request, response):
+        start = time.perf_counter()
+
+        def render_finished(response):
+            request._metrics["render"] += time.perf_counter() - start
+
+        response.add_post_render_callback(render_finished)
+        return response
+
+
+def get_pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+class ReplicaRoutingMiddleware:
+    """Send reads of 'GET' and 'HEAD' requests to viewsets to a replica.
+
+    One replica of DATABASE_REPLICAS is chosen for the whole request.
+    After a successful write the reads of the user stay on 'default' for
+    REPLICA_PIN_SECONDS, so the user sees own changes despite the
+    replication lag. The user is taken from the JWT before the view
+    authenticates it, or from the session.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.authentication = CachedJWTAuthentication()
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            set_read_alias(None)
+        user = getattr(request, "user", None)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        ):
+            caches[settings.REPLICA_PIN_CACHE].set(
+                get_pin_key(user.pk), True, settings.REPLICA_PIN_SECONDS
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in ("GET", "HEAD")
+            and getattr(view_func, "actions", None)
+            and not self.is_pinned(request)
+        ):
+            set_read_alias(random.choice(settings.DATABASE_REPLICAS))
+
+    def get_user_id(self, request):
+        header = self.authentication.get_header(request)
+        raw_token = header and self.authentication.get_raw_token(header)
+        if raw_token:
+            try:
+                token = self.authentication.get_validated_token(raw_token)
+            except TokenError:
+                return None
+            return token.get(api_settings.USER_ID_CLAIM)
+        user = getattr(request, "user", None)
+        return user.pk if user is not None else None
+
+    def is_pinned(self, request):
+        user_id = self.get_user_id(request)
+        return user_id is not None and bool(
+            caches[settings.REPLICA_PIN_CACHE].get(get_pin_key(user_id))
+        )
@@ -1,6 +1,24 @@
 """Custom viewsets."""
 
-from rest_framework import mixins, viewsets
+import hashlib
+from calendar import timegm
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from api.cache import (
+    count,
+    get_cache,
+    get_key,
+    HITS_KEY,
+    invalidate,
+    MISSES_KEY,
+)
+from api.signals import INVALIDATED_GROUPS
 
 
 class CreateListDeleteViewSet(
@@ -12,7 +30,235 @@ class CreateListDeleteViewSet(
     """Viewset allows methods: GET(queryset), POST, DELETE."""
 
 
+class ListViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Viewset allows methods: GET(queryset)."""
+
+
 class ModelViewSetWithoutPUT(viewsets.ModelViewSet):
     """The viewset allows all methods except PUT."""
 
     http_method_names = ("get", "post", "patch", "delete", "head", "options")
+
+
+class CursorPaginationMixin:
+    """Switch to keyset pagination when the client sends 'cursor' param.
+
+    An empty 'cursor' param requests the first page.
+    """
+
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        if (
+            not hasattr(self, "_paginator")
+            and self.cursor_pagination_class is not None
+            and self.cursor_pagination_class.cursor_query_param
+            in self.request.query_params
+        ):
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+
+class BulkCreateMixin:
+    """Create many objects by POST of a list to 'bulk/'.
+
+    Valid items are created even if some items are invalid, errors are
+    answered by the index of the item: 201 if all the items are created,
+    207 if some of them, 400 if none.
+    """
+
+    bulk_serializer_class = None
+
+    @action(detail=False, methods=("post",), url_path="bulk")
+    def bulk(self, request):
+        serializer = self.bulk_serializer_class(
+            data=request.data,
+            many=True,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        if serializer.validated_data:
+            serializer.save()
+            invalidate(*INVALIDATED_GROUPS[self.get_queryset().model])
+        results = serializer.get_results()
+        if not results["errors"]:
+            response_status = status.HTTP_201_CREATED
+        elif results["created"]:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(results, status=response_status)
+
+
+class RowListMixin:
+    """Serialize 'list' responses from '.values()' rows.
+
+    The rows have the columns of 'row_serializer_class', which builds the
+    output without model instances.
+    """
+
+    row_serializer_class = None
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return self.row_serializer_class
+        return super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == "list":
+            queryset = self.row_serializer_class.get_rows(
+                queryset.prefetch_related(None)
+            )
+        return queryset
+
+
+class CachedListMixin:
+    """Cache responses to anonymous 'list' requests.
+
+    Cached responses of 'cache_group' are dropped when its data changes.
+    """
+
+    cache_group = None
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        cache = get_cache()
+        key = get_key(self.cache_group, request)
+        cached = cache.get(key)
+        if cached is not None:
+            count(HITS_KEY)
+            # Validators of 'ConditionalGetMixin'.
+            data, self.version, self.last_modified = cached
+            return Response(data, headers={"X-Cache": "HIT"})
+        count(MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(
+                key,
+                (
+                    response.data,
+                    getattr(self, "version", None),
+                    getattr(self, "last_modified", None),
+                ),
+            )
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class CachedListRetrieveMixin(CachedListMixin):
+    """Cache responses to anonymous 'list' and 'retrieve' requests."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class NotModified(Exception):
+    """Stop the handler, the client copy is fresh."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """Answer 'list' and 'retrieve' with 304 if the client copy is fresh.
+
+    The ETag is the hash of the ids and 'modified' dates of the fetched
+    rows, the page state (row count or cursor links), the full path and
+    the negotiated media type; response caches keep the version of the
+    data without the media type. It is checked right after the rows are
+    fetched, so a 304 skips the serialization. Writes which change the
+    shown data of other rows (renames of categories, genres and users)
+    bump their 'modified' date. Last-Modified is sent by 'retrieve' only:
+    a deleted row does not change the latest date of a page.
+    """
+
+    version = None
+    last_modified = None
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            paginator = self.paginator
+            state = (
+                (paginator.has_next, paginator.has_previous)
+                if isinstance(paginator, CursorPagination)
+                else paginator.page.paginator.count
+            )
+            rows = (
+                (row["id"], row["modified"])
+                if isinstance(row, dict)
+                else (row.pk, row.modified)
+                for row in page
+            )
+            self.check_freshness(state, *rows)
+        return page
+
+    def get_object(self):
+        obj = super().get_object()
+        self.last_modified = timegm(obj.modified.utctimetuple())
+        self.check_freshness(None, (obj.pk, obj.modified))
+        return obj
+
+    def check_freshness(self, state, *rows):
+        """Set the version of the data, raise NotModified if it is fresh."""
+        self.version = hashlib.md5(
+            "{}:{}:{}".format(
+                self.request.get_full_path(),
+                state,
+                ",".join(
+                    f"{pk}@{modified.isoformat()}" for pk, modified in rows
+                ),
+            ).encode()
+        ).hexdigest()
+        response = self.get_not_modified_response()
+        if response is not None:
+            raise NotModified(response)
+
+    def get_etag(self):
+        # Every media type is a representation with its own ETag.
+        return '"{}"'.format(
+            hashlib.md5(
+                f"{self.version}:{self.request.accepted_media_type}".encode()
+            ).hexdigest()
+        )
+
+    def get_not_modified_response(self):
+        return get_conditional_response(
+            self.request,
+            etag=self.get_etag(),
+            last_modified=self.last_modified,
+        )
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        try:
+            response = handler(request, *args, **kwargs)
+        except NotModified as error:
+            response = error.response
+        else:
+            if response.status_code != 200 or self.version is None:
+                return response
+            # Validators of a cached response are checked here.
+            response = self.get_not_modified_response() or response
+        response["ETag"] = self.get_etag()
+        if self.last_modified:
+            response["Last-Modified"] = http_date(self.last_modified)
+        return response
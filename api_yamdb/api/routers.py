@@ -0,0 +1,36 @@
+"""Custom database routers."""
+
+import threading
+
+_state = threading.local()
+
+
+def get_read_alias():
+    return getattr(_state, "alias", None)
+
+
+def set_read_alias(alias):
+    """Send reads of the current thread to the alias, None - default."""
+    _state.alias = alias
+
+
+class ReplicaRouter:
+    """Send reads to the replica chosen for the request.
+
+    The replica is set by 'ReplicaRoutingMiddleware' for safe requests to
+    the viewsets. Reads related to a loaded object use the database of the
+    object, writes always go to 'default'.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return get_read_alias()
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas are copies of 'default'.
+        return True
@@ -0,0 +1,35 @@
+"""Signal handlers of the 'api' application."""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache import invalidate
+from api.v1.authentication import invalidate_user
+from reviews.models import Category, Genre, Review, Title
+from users.models import User
+
+# Cached groups of responses which show data of the model.
+INVALIDATED_GROUPS = {
+    Category: ("categories", "titles"),
+    Genre: ("genres", "titles"),
+    Title: ("titles",),
+    Review: ("titles",),
+}
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def model_changed(sender, **kwargs):
+    if sender in INVALIDATED_GROUPS:
+        invalidate(*INVALIDATED_GROUPS[sender])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, **kwargs):
+    invalidate(*INVALIDATED_GROUPS[Title])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    invalidate_user(instance)
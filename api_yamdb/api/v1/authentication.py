@@ -0,0 +1,81 @@
+"""Custom authentications."""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+# Fields read by permissions: other fields of the user are loaded lazily.
+SNAPSHOT_FIELDS = (
+    "id",
+    "username",
+    "role",
+    "is_staff",
+    "is_superuser",
+    "is_active",
+)
+
+
+def get_user_cache_key(user_id):
+    return f"jwt-user:{user_id}"
+
+
+def invalidate_user(user):
+    caches[settings.JWT_USER_CACHE].delete(
+        get_user_cache_key(getattr(user, api_settings.USER_ID_FIELD))
+    )
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication taking the user snapshot from the cache.
+
+    The user is built with SNAPSHOT_FIELDS only, the rest of its fields
+    are deferred, so it can be saved and used as a foreign key as usual.
+    The snapshot is read from the primary database: a lagging replica
+    would cache the old role after the invalidation of the snapshot.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+        cache = caches[settings.JWT_USER_CACHE]
+        key = get_user_cache_key(user_id)
+        snapshot = cache.get(key)
+        db = router.db_for_write(self.user_model)
+        if snapshot is None:
+            snapshot = (
+                self.user_model.objects.using(db)
+                .filter(**{api_settings.USER_ID_FIELD: user_id})
+                .values(*SNAPSHOT_FIELDS)
+                .first()
+            )
+            if snapshot is None:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                )
+            cache.set(key, snapshot, settings.JWT_USER_CACHE_TIMEOUT)
+        if not snapshot["is_active"]:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        # 'from_db' expects values in the order of the model fields.
+        field_names = [
+            field.attname
+            for field in self.user_model._meta.concrete_fields
+            if field.attname in snapshot
+        ]
+        return self.user_model.from_db(
+            db,
+            field_names,
+            [snapshot[name] for name in field_names],
+        )
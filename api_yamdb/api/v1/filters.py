@@ -1,18 +1,72 @@
 """Custom filters."""
 
 import django_filters
-from django_filters import CharFilter
+from django_filters import (
+    BaseInFilter,
+    CharFilter,
+    ChoiceFilter,
+    NumberFilter,
+    OrderingFilter,
+)
 
 from reviews.models import Title
+from reviews.search import TITLE_INDEX
+
+
+class CharInFilter(BaseInFilter, CharFilter):
+    """Filter by comma separated values."""
+
+
+class StableOrderingFilter(OrderingFilter):
+    """Ordering filter with the primary key as the last ordering field."""
+
+    def filter(self, queryset, value):
+        queryset = super().filter(queryset, value)
+        if value:
+            queryset = queryset.order_by(*queryset.query.order_by, "pk")
+        return queryset
 
 
 class TitleFilter(django_filters.FilterSet):
-    """'Title' resource content display filter."""
+    """'Title' resource content display filter.
+
+    Genres are checked by subqueries over the 'title_genre' table instead
+    of joins, so titles are not repeated and no DISTINCT is needed.
+    """
 
     name = CharFilter(lookup_expr="icontains")
     category = CharFilter(field_name="category__slug")
-    genre = CharFilter(field_name="genre__slug")
+    genre = CharInFilter(method="filter_genre")
+    genre_match = ChoiceFilter(
+        choices=(("any", "any"), ("all", "all")),
+        method="filter_genre_match",
+    )
+    year_min = NumberFilter(field_name="year", lookup_expr="gte")
+    year_max = NumberFilter(field_name="year", lookup_expr="lte")
+    rating_min = NumberFilter(field_name="rating", lookup_expr="gte")
+    rating_max = NumberFilter(field_name="rating", lookup_expr="lte")
+    search = CharFilter(method="filter_search")
+    ordering = StableOrderingFilter(fields=("rating", "year", "name"))
 
     class Meta:
         model = Title
         fields = ("name", "category", "genre", "year")
+
+    def filter_genre(self, queryset, name, value):
+        through = Title.genre.through.objects
+        if self.form.cleaned_data.get("genre_match") == "all":
+            for slug in set(value):
+                queryset = queryset.filter(
+                    pk__in=through.filter(genre__slug=slug).values("title_id")
+                )
+            return queryset
+        return queryset.filter(
+            pk__in=through.filter(genre__slug__in=value).values("title_id")
+        )
+
+    def filter_genre_match(self, queryset, name, value):
+        # Applied by 'filter_genre'.
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        return TITLE_INDEX.search(queryset, value)
@@ -0,0 +1,20 @@
+"""Custom paginations."""
+
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class TitleCursorPagination(CursorPagination):
+    """Keyset pagination of 'Title' resource: no COUNT and OFFSET scans."""
+
+    ordering = ("name", "id")
+    page_size_query_param = "page_size"
+    max_page_size = settings.MAX_PAGE_SIZE
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Keyset pagination of 'Review' and 'Comment' resources."""
+
+    ordering = ("pub_date", "id")
+    page_size_query_param = "page_size"
+    max_page_size = settings.MAX_PAGE_SIZE
@@ -0,0 +1,46 @@
+"""Custom parsers."""
+
+import codecs
+
+import msgpack
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from api.v1 import renderers
+
+
+class FastJSONParser(JSONParser):
+    """Parse JSON by 'orjson' when it is installed.
+
+    'orjson' reads only UTF-8, other encodings are left to the DRF parser.
+    Like the strict DRF parser it rejects 'NaN' and 'Infinity'. The module
+    is looked up in 'renderers' on each call, the same as the renderer.
+    """
+
+    renderer_class = renderers.FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if (
+            renderers.orjson is None
+            or codecs.lookup(encoding).name != "utf-8"
+        ):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return renderers.orjson.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
+
+
+class MessagePackParser(BaseParser):
+    """Parse MessagePack, map keys must be strings."""
+
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read())
+        except ValueError as exc:
+            raise ParseError("MessagePack parse error - %s" % str(exc))
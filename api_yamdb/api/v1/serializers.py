@@ -1,11 +1,22 @@
 """Serializers of the 'api' application."""
 
+import json
+
 from django.conf import settings
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import (
+    connections,
+    DatabaseError,
+    IntegrityError,
+    router,
+    transaction,
+)
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import get_snippet
 from users.models import User
 
 
@@ -16,6 +27,13 @@ def unacceptable_username(username):
         )
 
 
+def unacceptable_slug(slug):
+    if slug in settings.UNACCEPTABLE_SLUGS:
+        raise serializers.ValidationError(
+            f"The slug '{slug}' is not allowed."
+        )
+
+
 class CategorySerializer(serializers.ModelSerializer):
     """Serializer for requests to endpoints of 'Categories' resource."""
 
@@ -23,6 +41,10 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ("name", "slug")
         model = Category
 
+    def validate_slug(self, value):
+        unacceptable_slug(value)
+        return value
+
 
 class GenreSerializer(serializers.ModelSerializer):
     """Serializer for requests to endpoints of 'Genres' resource."""
@@ -31,6 +53,10 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ("name", "slug")
         model = Genre
 
+    def validate_slug(self, value):
+        unacceptable_slug(value)
+        return value
+
 
 class TitleSerializerRead(serializers.ModelSerializer):
     """Serializer for requests 'GET' to endpoints of Titles resource."""
@@ -52,12 +78,44 @@ class TitleSerializerRead(serializers.ModelSerializer):
         model = Title
 
 
+def resolve_slugs(queryset, slugs):
+    """Objects of the queryset by their slugs, got by one query."""
+    return queryset.in_bulk(set(slugs), field_name="slug")
+
+
+def get_unknown_slugs_error(slugs):
+    return [f"Object with slug={slug} does not exist." for slug in slugs]
+
+
+class SlugListRelatedField(serializers.ListField):
+    """List of objects of the queryset by their slugs.
+
+    All the objects are found by one query, unknown slugs are reported
+    together.
+    """
+
+    child = serializers.SlugField()
+
+    def __init__(self, queryset, **kwargs):
+        self.queryset = queryset
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        slugs = super().to_internal_value(data)
+        objects = resolve_slugs(self.queryset, slugs)
+        unknown = [slug for slug in slugs if slug not in objects]
+        if unknown:
+            raise ValidationError(get_unknown_slugs_error(unknown))
+        return [objects[slug] for slug in dict.fromkeys(slugs)]
+
+    def to_representation(self, value):
+        return [obj.slug for obj in value.all()]
+
+
 class TitleSerializerWrite(serializers.ModelSerializer):
     """Serializer for requests (excl 'GET') to 'Titles' resource endpoints."""
 
-    genre = serializers.SlugRelatedField(
-        slug_field="slug", queryset=Genre.objects.all(), many=True
-    )
+    genre = SlugListRelatedField(queryset=Genre.objects.all())
     category = serializers.SlugRelatedField(
         slug_field="slug", queryset=Category.objects.all()
     )
@@ -74,6 +132,203 @@ class TitleSerializerWrite(serializers.ModelSerializer):
         model = Title
 
 
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """Validate a list of new objects, create the valid ones in bulk.
+
+    Items are validated by the child one by one, then 'validate_batch'
+    checks them against the database for the whole list at once. Errors
+    of invalid items are kept in 'item_errors' by the item index, the
+    rest of the items are created by 'save()'.
+    """
+
+    default_error_messages = {
+        "max_length": "Ensure this list has no more than {max_length} items."
+    }
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("allow_empty", False)
+        super().__init__(*args, **kwargs)
+        self.item_errors = {}
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            return super().to_internal_value(data)
+        if len(data) > settings.BULK_CREATE_MAX_ITEMS:
+            message = self.error_messages["max_length"].format(
+                max_length=settings.BULK_CREATE_MAX_ITEMS
+            )
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]},
+                code="max_length",
+            )
+        items = {}
+        for index, item in enumerate(data):
+            try:
+                items[index] = self.child.run_validation(item)
+            except ValidationError as exc:
+                self.item_errors[index] = exc.detail
+        if items:
+            self.item_errors.update(self.validate_batch(items))
+        return [
+            item
+            for index, item in items.items()
+            if index not in self.item_errors
+        ]
+
+    def validate_batch(self, items):
+        """Errors of the validated items by their index."""
+        return {}
+
+    def get_results(self):
+        return {
+            "created": self.data if self.validated_data else [],
+            "errors": [
+                {"index": index, "errors": errors}
+                for index, errors in sorted(self.item_errors.items())
+            ],
+        }
+
+
+class SlugBulkCreateListSerializer(BulkCreateListSerializer):
+    """Bulk creation of categories or genres, their slugs are unique."""
+
+    def validate_batch(self, items):
+        model = self.child.Meta.model
+        slug_field = model._meta.get_field("slug")
+        message = slug_field.error_messages["unique"] % {
+            "model_name": model._meta.verbose_name,
+            "field_label": slug_field.verbose_name,
+        }
+        taken = set(
+            resolve_slugs(
+                model.objects.all(), (item["slug"] for item in items.values())
+            )
+        )
+        errors = {}
+        for index, item in items.items():
+            if item["slug"] in taken:
+                errors[index] = {"slug": [message]}
+            taken.add(item["slug"])
+        return errors
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        return model.objects.bulk_create(
+            model(**item) for item in validated_data
+        )
+
+
+class CategoryBulkSerializer(CategorySerializer):
+    """Serializer for items of bulk creation of 'Categories' resource."""
+
+    slug = serializers.SlugField(max_length=50)
+
+    class Meta(CategorySerializer.Meta):
+        list_serializer_class = SlugBulkCreateListSerializer
+
+
+class GenreBulkSerializer(GenreSerializer):
+    """Serializer for items of bulk creation of 'Genres' resource."""
+
+    slug = serializers.SlugField(max_length=50)
+
+    class Meta(GenreSerializer.Meta):
+        list_serializer_class = SlugBulkCreateListSerializer
+
+
+class TitleBulkListSerializer(BulkCreateListSerializer):
+    """Bulk creation of titles with their genres.
+
+    Genres and categories of all the titles are found by one query each.
+    """
+
+    def validate_batch(self, items):
+        genres = resolve_slugs(
+            Genre.objects.all(),
+            (slug for item in items.values() for slug in item["genre"]),
+        )
+        categories = resolve_slugs(
+            Category.objects.all(),
+            (item["category"] for item in items.values()),
+        )
+        errors = {}
+        for index, item in items.items():
+            unknown_genres = [
+                slug for slug in item["genre"] if slug not in genres
+            ]
+            if unknown_genres:
+                errors.setdefault(index, {})["genre"] = (
+                    get_unknown_slugs_error(unknown_genres)
+                )
+            if item["category"] not in categories:
+                errors.setdefault(index, {})["category"] = (
+                    get_unknown_slugs_error((item["category"],))
+                )
+            if index not in errors:
+                item["genre"] = [
+                    genres[slug] for slug in dict.fromkeys(item["genre"])
+                ]
+                item["category"] = categories[item["category"]]
+        return errors
+
+    def create(self, validated_data):
+        titles = [
+            Title(**{key: item[key] for key in item if key != "genre"})
+            for item in validated_data
+        ]
+        db = router.db_for_write(Title)
+        connection = connections[db]
+        with transaction.atomic(using=db):
+            if connection.features.can_return_ids_from_bulk_insert:
+                Title.objects.using(db).bulk_create(titles)
+            elif connection.vendor == "sqlite":
+                # SQLite does not return the ids of inserted rows. The
+                # transaction holds the write lock of the whole database,
+                # so the last ids are the ids of these titles.
+                Title.objects.using(db).bulk_create(titles)
+                ids = Title.objects.using(db).order_by("-pk").values_list(
+                    "pk", flat=True
+                )[: len(titles)]
+                for title, pk in zip(titles, sorted(ids)):
+                    title.pk = pk
+            else:
+                # Concurrent inserts may interleave with the batch, so its
+                # ids can't be read back: insert the titles one by one.
+                for title in titles:
+                    title.save(using=db)
+            Title.genre.through.objects.using(db).bulk_create(
+                Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+                for title, item in zip(titles, validated_data)
+                for genre in item["genre"]
+            )
+        for title, item in zip(titles, validated_data):
+            title.created_genres = item["genre"]
+        return titles
+
+
+class TitleBulkSerializer(TitleSerializerWrite):
+    """Serializer for items of bulk creation of 'Titles' resource.
+
+    Slugs are checked by 'TitleBulkListSerializer' for the whole list.
+    """
+
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField()
+
+    class Meta(TitleSerializerWrite.Meta):
+        list_serializer_class = TitleBulkListSerializer
+
+    def to_representation(self, instance):
+        return {
+            "id": instance.pk,
+            "name": instance.name,
+            "year": instance.year,
+            "description": instance.description,
+            "genre": [genre.slug for genre in instance.created_genres],
+            "category": instance.category.slug,
+        }
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     """Serializer for requests to endpoints of 'Reviews' resource."""
 
@@ -85,18 +340,18 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ("id", "text", "author", "score", "pub_date")
 
-    def validate(self, data):
-        request = self.context["request"]
-        if request.method != "POST":
-            return data
-        title_id = self.context["request"].parser_context["kwargs"]["title_id"]
-        if Review.objects.filter(
-            title_id=title_id, author=request.user
-        ).exists():
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
             raise ValidationError(
-                """You can only leave one review for this creation."""
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        "You can only leave one review for this creation."
+                    ]
+                }
             )
-        return data
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -111,6 +366,210 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ("id", "text", "author", "pub_date")
 
 
+class RowSerializer(serializers.BaseSerializer):
+    """Read-only serializer of '.values()' rows.
+
+    Subclasses list the row columns in 'values' and build the output
+    dicts by hand, the same as the model serializer of the resource gives,
+    without fields introspection and model instances. The 'modified'
+    column is read by 'ConditionalGetMixin'.
+    """
+
+    values = ()
+    datetime_field = serializers.DateTimeField()
+
+    @classmethod
+    def get_rows(cls, queryset):
+        return queryset.values(*cls.values, *queryset.query.extra)
+
+
+class ReviewRowSerializer(RowSerializer):
+    """Row serializer with the output of 'ReviewSerializer'."""
+
+    values = (
+        "id",
+        "text",
+        "author__username",
+        "score",
+        "pub_date",
+        "modified",
+    )
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "text": row["text"],
+            "author": row["author__username"],
+            "score": row["score"],
+            "pub_date": self.datetime_field.to_representation(
+                row["pub_date"]
+            ),
+        }
+
+
+class CommentRowSerializer(RowSerializer):
+    """Row serializer with the output of 'CommentSerializer'."""
+
+    values = ("id", "text", "author__username", "pub_date", "modified")
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "text": row["text"],
+            "author": row["author__username"],
+            "pub_date": self.datetime_field.to_representation(
+                row["pub_date"]
+            ),
+        }
+
+
+# JSON array of the genres of the title, in the default genre ordering.
+GENRES_JSON_SQL = {
+    "sqlite": (
+        "SELECT json_group_array(json_object('name', name, 'slug', slug)) "
+        "FROM (SELECT g.name, g.slug FROM reviews_genre g "
+        "INNER JOIN reviews_title_genre tg ON tg.genre_id = g.id "
+        "WHERE tg.title_id = reviews_title.id ORDER BY g.name, g.slug)"
+    ),
+    "postgresql": (
+        "SELECT coalesce(json_agg(json_build_object('name', g.name, "
+        "'slug', g.slug) ORDER BY g.name, g.slug), '[]') "
+        "FROM reviews_genre g "
+        "INNER JOIN reviews_title_genre tg ON tg.genre_id = g.id "
+        "WHERE tg.title_id = reviews_title.id"
+    ),
+}
+
+_genres_json_supported = {}
+
+
+def get_genres_json_sql(connection):
+    """SQL of the title genres JSON, None if the database can't build it."""
+    sql = GENRES_JSON_SQL.get(connection.vendor)
+    if sql is None or connection.vendor != "sqlite":
+        return sql
+    if connection.alias not in _genres_json_supported:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT json_group_array(json_object())")
+            _genres_json_supported[connection.alias] = True
+        except DatabaseError:
+            _genres_json_supported[connection.alias] = False
+    return sql if _genres_json_supported[connection.alias] else None
+
+
+class TitleRowListSerializer(serializers.ListSerializer):
+    """Add genres to the title rows.
+
+    Genres come in the rows as JSON ('genres_json'), where the database
+    can aggregate them, or else by one query for the whole page.
+    """
+
+    def to_representation(self, data):
+        rows = list(data)
+        if rows and "genres_json" not in rows[0]:
+            genres = self.get_genres(rows)
+            rows = [{**row, "genres_json": genres[row["id"]]} for row in rows]
+        return [self.child.to_representation(row) for row in rows]
+
+    def get_genres(self, rows):
+        genres = {row["id"]: [] for row in rows}
+        for title_id, name, slug in (
+            Title.genre.through.objects.filter(title_id__in=genres)
+            .order_by("genre__name", "genre__slug")
+            .values_list("title_id", "genre__name", "genre__slug")
+        ):
+            genres[title_id].append({"name": name, "slug": slug})
+        return genres
+
+
+class TitleRowSerializer(RowSerializer):
+    """Row serializer with the output of 'TitleSerializerRead'.
+
+    Genres are added to the rows by the query or by
+    'TitleRowListSerializer'.
+    """
+
+    values = (
+        "id",
+        "name",
+        "year",
+        "rating",
+        "description",
+        "category__name",
+        "category__slug",
+        "modified",
+    )
+
+    class Meta:
+        list_serializer_class = TitleRowListSerializer
+
+    @classmethod
+    def get_rows(cls, queryset):
+        sql = get_genres_json_sql(connections[queryset.db])
+        if sql is not None:
+            # 'extra' but not 'annotate', so counting rows by the
+            # paginator does not build the genres.
+            queryset = queryset.extra(select={"genres_json": sql})
+        return super().get_rows(queryset)
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "year": row["year"],
+            "rating": row["rating"],
+            "description": row["description"],
+            "genre": (
+                json.loads(row["genres_json"])
+                if isinstance(row["genres_json"], str)
+                else row["genres_json"]
+            ),
+            "category": row["category__slug"]
+            and {"name": row["category__name"], "slug": row["category__slug"]},
+        }
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Serializer for parameters of full-text search requests."""
+
+    q = serializers.CharField()
+    title = serializers.IntegerField(required=False)
+
+
+class ReviewSearchSerializer(ReviewSerializer):
+    """Serializer for found reviews with the highlighted snippet."""
+
+    snippet = serializers.SerializerMethodField()
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ("id", "title", "text", "snippet", "author", "pub_date")
+
+    def get_snippet(self, obj):
+        return get_snippet(obj.text, self.context["query"])
+
+
+class CommentSearchSerializer(CommentSerializer):
+    """Serializer for found comments with the highlighted snippet."""
+
+    title = serializers.IntegerField(source="review.title_id")
+    snippet = serializers.SerializerMethodField()
+
+    class Meta(CommentSerializer.Meta):
+        fields = (
+            "id",
+            "title",
+            "review",
+            "text",
+            "snippet",
+            "author",
+            "pub_date",
+        )
+
+    def get_snippet(self, obj):
+        return get_snippet(obj.text, self.context["query"])
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for requests to endpoints of 'Users' resource."""
 
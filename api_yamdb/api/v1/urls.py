@@ -4,10 +4,15 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from api.v1.views import (
+    cache_stats,
     CategoryViewSet,
+    CommentSearchViewSet,
     CommentViewSet,
     GenreViewSet,
     get_token,
+    mail_stats,
+    metrics,
+    ReviewSearchViewSet,
     ReviewViewSet,
     signup,
     TitleViewSet,
@@ -30,6 +35,13 @@ router_v1.register(
     basename="comments",
 )
 
+router_v1.register(
+    "search/reviews", ReviewSearchViewSet, basename="search_reviews"
+)
+router_v1.register(
+    "search/comments", CommentSearchViewSet, basename="search_comments"
+)
+
 router_v1.register("users", UserViewset, basename="users")
 
 auth_urlpatterns = [
@@ -39,5 +51,8 @@ auth_urlpatterns = [
 
 urlpatterns = [
     path("auth/", include(auth_urlpatterns)),
+    path("cache/stats/", cache_stats, name="cache_stats"),
+    path("mail/stats/", mail_stats, name="mail_stats"),
+    path("metrics/", metrics, name="metrics"),
     path("", include(router_v1.urls)),
 ]
@@ -1,125 +1,247 @@
 """URLs request handlers of the 'api' application."""
 
-from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.db import utils
-from django.db.models import Avg
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, serializers, status
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (
+    action,
+    api_view,
+    permission_classes,
+    renderer_classes,
+)
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
 
+from api.cache import get_stats
+from api.metrics import registry
 from api.mixins import (
+    BulkCreateMixin,
+    CachedListMixin,
+    CachedListRetrieveMixin,
+    ConditionalGetMixin,
     CreateListDeleteViewSet,
+    CursorPaginationMixin,
+    ListViewSet,
     ModelViewSetWithoutPUT,
+    RowListMixin,
 )
 from api.v1.filters import TitleFilter
+from api.v1.pagination import PubDateCursorPagination, TitleCursorPagination
+from api.v1.renderers import PrometheusRenderer
 from api.v1.permissions import (
     IsAdmin,
     IsAdminModeratorAuthorOrReadOnly,
     IsAdminOrReadOnly,
 )
 from api.v1.serializers import (
+    CategoryBulkSerializer,
     CategorySerializer,
+    CommentSearchSerializer,
+    CommentRowSerializer,
     CommentSerializer,
+    GenreBulkSerializer,
     GenreSerializer,
     GetTokenSerializer,
+    ReviewRowSerializer,
+    ReviewSearchSerializer,
     ReviewSerializer,
+    SearchQuerySerializer,
     SignUpSerializer,
+    TitleBulkSerializer,
+    TitleRowSerializer,
     TitleSerializerRead,
     TitleSerializerWrite,
     UserSerializer,
 )
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import COMMENT_INDEX, REVIEW_INDEX
+from users.mail import metrics as mail_metrics, queue_email
 from users.models import User
 
 
-class CategoryViewSet(CreateListDeleteViewSet):
+class CategoryViewSet(
+    BulkCreateMixin, CachedListMixin, CreateListDeleteViewSet
+):
     """URL requests handler to 'Categories' resource endpoints."""
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    bulk_serializer_class = CategoryBulkSerializer
+    cache_group = "categories"
     permission_classes = (IsAdminOrReadOnly,)
     lookup_field = "slug"
     filter_backends = (filters.SearchFilter,)
     search_fields = ("name",)
 
 
-class GenreViewSet(CreateListDeleteViewSet):
+class GenreViewSet(BulkCreateMixin, CachedListMixin, CreateListDeleteViewSet):
     """URL requests handler to 'Genres' resource endpoints."""
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    bulk_serializer_class = GenreBulkSerializer
+    cache_group = "genres"
     permission_classes = (IsAdminOrReadOnly,)
     lookup_field = "slug"
     filter_backends = (filters.SearchFilter,)
     search_fields = ("name",)
 
 
-class TitleViewSet(ModelViewSetWithoutPUT):
+class TitleViewSet(
+    BulkCreateMixin,
+    ConditionalGetMixin,
+    CachedListRetrieveMixin,
+    CursorPaginationMixin,
+    RowListMixin,
+    ModelViewSetWithoutPUT,
+):
     """URL requests handler to 'Titles' resource endpoints."""
 
     queryset = Title.objects.select_related(
         "category"
     ).prefetch_related(
         "genre"
-    ).annotate(
-        rating=Avg("reviews__score")
     ).order_by("name")
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    cursor_pagination_class = TitleCursorPagination
+    serializer_class = TitleSerializerWrite
+    row_serializer_class = TitleRowSerializer
+    bulk_serializer_class = TitleBulkSerializer
+    cache_group = "titles"
 
     def get_serializer_class(self):
-        if self.action in {"list", "retrieve"}:
+        if self.action == "retrieve":
             return TitleSerializerRead
-        return TitleSerializerWrite
+        return super().get_serializer_class()
 
 
-class ReviewViewSet(ModelViewSetWithoutPUT):
+class ReviewViewSet(
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    RowListMixin,
+    ModelViewSetWithoutPUT,
+):
     """URL requests handler to 'Reviews' resource endpoints."""
 
     serializer_class = ReviewSerializer
+    row_serializer_class = ReviewRowSerializer
     permission_classes = (IsAdminModeratorAuthorOrReadOnly,)
+    cursor_pagination_class = PubDateCursorPagination
 
     def get_title_obj(self):
-        return get_object_or_404(Title, id=self.kwargs["title_id"])
+        if not hasattr(self, "_title"):
+            self._title = get_object_or_404(Title, id=self.kwargs["title_id"])
+        return self._title
 
     def get_queryset(self):
-        title = self.get_title_obj()
-        return title.reviews.select_related("author")
+        return Review.objects.filter(
+            title_id=self.kwargs["title_id"]
+        ).select_related("author")
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.get_title_obj()
+        return page
 
     def perform_create(self, serializer):
         title = self.get_title_obj()
         serializer.save(author=self.request.user, title=title)
 
 
-class CommentViewSet(ModelViewSetWithoutPUT):
+class CommentViewSet(
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    RowListMixin,
+    ModelViewSetWithoutPUT,
+):
     """URL requests handler to 'Comments' resource endpoints."""
 
     serializer_class = CommentSerializer
+    row_serializer_class = CommentRowSerializer
     permission_classes = (IsAdminModeratorAuthorOrReadOnly,)
+    cursor_pagination_class = PubDateCursorPagination
 
     def get_review_obj(self):
-        return get_object_or_404(
-            Review,
-            id=self.kwargs["review_id"],
-            title_id=self.kwargs["title_id"],
-        )
+        if not hasattr(self, "_review"):
+            self._review = get_object_or_404(
+                Review,
+                id=self.kwargs["review_id"],
+                title_id=self.kwargs["title_id"],
+            )
+        return self._review
 
     def get_queryset(self):
-        review = self.get_review_obj()
-        return review.comments.select_related("author")
+        return Comment.objects.filter(
+            review_id=self.kwargs["review_id"],
+            review__title_id=self.kwargs["title_id"],
+        ).select_related("author")
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.get_review_obj()
+        return page
 
     def perform_create(self, serializer):
         review = self.get_review_obj()
         serializer.save(author=self.request.user, review=review)
 
 
+class TextSearchViewSet(ListViewSet):
+    """Base handler of full-text search, found rows best first.
+
+    The query is in the 'q' parameter, 'title' limits the search to
+    the creation.
+    """
+
+    permission_classes = (AllowAny,)
+    search_index = None
+    title_lookup = None
+
+    def get_params(self):
+        if not hasattr(self, "_params"):
+            params = SearchQuerySerializer(data=self.request.query_params)
+            params.is_valid(raise_exception=True)
+            self._params = params.validated_data
+        return self._params
+
+    def get_queryset(self):
+        params = self.get_params()
+        queryset = super().get_queryset()
+        if "title" in params:
+            queryset = queryset.filter(**{self.title_lookup: params["title"]})
+        return self.search_index.search(queryset, params["q"])
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["query"] = self.get_params()["q"]
+        return context
+
+
+class ReviewSearchViewSet(TextSearchViewSet):
+    """URL requests handler to search of 'Reviews' resource."""
+
+    queryset = Review.objects.select_related("author")
+    serializer_class = ReviewSearchSerializer
+    search_index = REVIEW_INDEX
+    title_lookup = "title_id"
+
+
+class CommentSearchViewSet(TextSearchViewSet):
+    """URL requests handler to search of 'Comments' resource."""
+
+    queryset = Comment.objects.select_related("author", "review")
+    serializer_class = CommentSearchSerializer
+    search_index = COMMENT_INDEX
+    title_lookup = "review__title_id"
+
+
 class UserViewset(ModelViewSetWithoutPUT):
     """URL requests handler to 'Users' resource endpoints."""
 
@@ -137,6 +259,9 @@ class UserViewset(ModelViewSetWithoutPUT):
         permission_classes=(IsAuthenticated,),
     )
     def users_me(self, request):
+        request.user.refresh_from_db(
+            fields=list(request.user.get_deferred_fields())
+        )
         if request.method == "GET":
             serializer = self.get_serializer(request.user)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -164,12 +289,10 @@ def signup(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
     conf_code = default_token_generator.make_token(user)
-    send_mail(
+    queue_email(
         subject="YaMDb confirmation code",
         message=f"Use this code to get an access token: {conf_code}",
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=(serializer.data["email"],),
-        fail_silently=False,
+        recipient=serializer.data["email"],
     )
     return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -191,3 +314,25 @@ def get_token(request):
         )
     access_token = AccessToken().for_user(user)
     return Response({"token": str(access_token)}, status=status.HTTP_200_OK)
+
+
+@api_view(("GET",))
+@permission_classes((IsAdmin,))
+def cache_stats(request):
+    """URL requests handler to the cache/stats/ endpoint."""
+    return Response(get_stats(), status=status.HTTP_200_OK)
+
+
+@api_view(("GET",))
+@permission_classes((IsAdmin,))
+def mail_stats(request):
+    """URL requests handler to the mail/stats/ endpoint."""
+    return Response(mail_metrics.as_dict(), status=status.HTTP_200_OK)
+
+
+@api_view(("GET",))
+@permission_classes((IsAdmin,))
+@renderer_classes((PrometheusRenderer,))
+def metrics(request):
+    """URL requests handler to the metrics/ endpoint."""
+    return Response(registry.export(), status=status.HTTP_200_OK)
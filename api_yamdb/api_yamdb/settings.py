@@ -21,16 +21,18 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt",
     "django_filters",
     "users.apps.UsersConfig",
-    "reviews",
-    "api",
+    "reviews.apps.ReviewsConfig",
+    "api.apps.ApiConfig",
 ]
 
 MIDDLEWARE = [
+    "api.middleware.QueryMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "api.middleware.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -63,6 +65,41 @@ DATABASES = {
     }
 }
 
+# Read replica of 'default', e.g. a copy of the SQLite file for local runs
+if os.environ.get("DB_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ["DB_REPLICA_NAME"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["api.routers.ReplicaRouter"]
+
+# Aliases of replicas for reads of safe requests to the viewsets
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+# Reads of a user stay on 'default' after a write, timeout in seconds
+REPLICA_PIN_CACHE = "default"
+REPLICA_PIN_SECONDS = 10
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "api_responses": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "api-responses",
+        "TIMEOUT": 300,
+    },
+}
+
+# Cache of responses to anonymous requests of catalogue endpoints
+API_RESPONSE_CACHE = "api_responses"
+
+# Cache of users authenticated by JWT, timeout in seconds
+JWT_USER_CACHE = "default"
+JWT_USER_CACHE_TIMEOUT = 60
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -96,7 +133,18 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.v1.authentication.CachedJWTAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.v1.renderers.FastJSONRenderer",
+        "api.v1.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.v1.parsers.FastJSONParser",
+        "api.v1.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 4,
@@ -111,7 +159,7 @@ if DEBUG:
     REST_FRAMEWORK.update(
         {
             "DEFAULT_AUTHENTICATION_CLASSES": [
-                "rest_framework_simplejwt.authentication.JWTAuthentication",
+                "api.v1.authentication.CachedJWTAuthentication",
                 "rest_framework.authentication.SessionAuthentication",
             ],
         }
@@ -121,7 +169,27 @@ if DEBUG:
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 DEFAULT_FROM_EMAIL = "YaMDb-email"
 
+# Outbox of emails: in-process workers (0 - only the 'send_emails' command),
+# eager mode sends emails in the request thread.
+# Workers flush the outbox when the batch is full or every flush interval.
+EMAIL_OUTBOX_WORKERS = 1
+EMAIL_OUTBOX_EAGER = False
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_FLUSH_INTERVAL = 2
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# Seconds after which emails claimed by a dead worker are sent again
+EMAIL_OUTBOX_CLAIM_TIMEOUT = 300
+
 # Constants
 UNACCEPTABLE_USERNAME = "me"
 
+# Slugs of categories and genres taken by paths of list actions
+UNACCEPTABLE_SLUGS = ("bulk",)
+
 NUM_CHAR = 15
+
+# Upper bound of the 'page_size' param of cursor pagination
+MAX_PAGE_SIZE = 100
+
+# Limit of items in one request to bulk creation endpoints
+BULK_CREATE_MAX_ITEMS = 1000
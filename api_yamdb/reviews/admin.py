@@ -38,6 +38,7 @@ class TitleAdmin(admin.ModelAdmin):
         "name",
         "year",
         "category",
+        "rating",
         "description",
     )
     list_editable = ("category",)
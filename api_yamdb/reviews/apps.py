@@ -5,3 +5,6 @@ from django.apps import AppConfig
 
 class ReviewsConfig(AppConfig):
     name = "reviews"
+
+    def ready(self):
+        import reviews.signals  # noqa: F401
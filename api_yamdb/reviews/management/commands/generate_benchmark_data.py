@@ -0,0 +1,226 @@
+"""Generate a synthetic dataset of the given scale for benchmarks."""
+
+import random
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core import management
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+
+from reviews.management.commands.import_test_data import (
+    clear_tables,
+    IMPORT_MODELS,
+    reset_sequences,
+)
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    """Fill the database with users, titles, reviews and comments.
+
+    Popularity of titles and reviews follows the Zipf law: a few hot
+    titles get most of the reviews.
+    """
+
+    help = "Generate a synthetic dataset of the given scale for benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=5)
+        parser.add_argument("--genres", type=int, default=30)
+        parser.add_argument("--titles", type=int, default=1000)
+        parser.add_argument("--reviews", type=int, default=20000)
+        parser.add_argument("--comments", type=int, default=20000)
+        parser.add_argument(
+            "--max-genres-per-title",
+            type=int,
+            default=3,
+            help="Every title gets from 1 to this number of genres.",
+        )
+        parser.add_argument(
+            "--zipf",
+            type=float,
+            default=1.1,
+            help="Exponent of the Zipf distribution of popularity.",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete existing catalogue, users, reviews and comments.",
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        if options["clear"]:
+            with transaction.atomic(), connection.cursor() as cursor:
+                clear_tables(cursor, IMPORT_MODELS)
+        with transaction.atomic():
+            users = self.create_users(options["users"])
+            categories = self.create_rows(
+                Category,
+                (
+                    {"name": f"Category {index}", "slug": f"category-{index}"}
+                    for index in range(options["categories"])
+                ),
+            )
+            genres = self.create_rows(
+                Genre,
+                (
+                    {"name": f"Genre {index}", "slug": f"genre-{index}"}
+                    for index in range(options["genres"])
+                ),
+            )
+            titles = self.create_titles(
+                options["titles"],
+                categories,
+                genres,
+                options["max_genres_per_title"],
+            )
+            reviews = self.create_reviews(
+                options["reviews"], titles, users, options["zipf"]
+            )
+            self.create_comments(
+                options["comments"], reviews, users, options["zipf"]
+            )
+            with connection.cursor() as cursor:
+                reset_sequences(cursor, IMPORT_MODELS)
+        management.call_command("recompute_ratings")
+        self.stdout.write("Benchmark data generated.")
+
+    def zipf_counts(self, total, size, exponent, limit=None):
+        """Split 'total' into 'size' counts following the Zipf law.
+
+        The counts add up to 'total' (at most 'limit' * 'size'): a count
+        over 'limit' is cut and the rest is shared by the next ranks, the
+        remainder of rounding goes to the largest fractions.
+        """
+        weights = [1 / rank ** exponent for rank in range(1, size + 1)]
+        if limit is not None:
+            total = min(total, limit * size)
+        shares = []
+        remaining = total
+        weights_left = sum(weights)
+        for weight in weights:
+            share = remaining * weight / weights_left
+            if limit is not None:
+                share = min(share, limit)
+            shares.append(share)
+            remaining -= share
+            weights_left -= weight
+        counts = [int(share) for share in shares]
+        by_fraction = sorted(
+            range(size), key=lambda rank: counts[rank] - shares[rank]
+        )
+        for rank in by_fraction[: total - sum(counts)]:
+            counts[rank] += 1
+        return counts
+
+    def create_rows(self, model, rows):
+        """Insert rows with explicit ids by batches, return their ids.
+
+        The ids are consecutive, so a range of them is returned instead
+        of a list of millions of ids.
+        """
+        max_id = model._base_manager.aggregate(max_id=Max("id"))["max_id"]
+        start = (max_id or 0) + 1
+        count = 0
+        objects = (
+            model(id=start + number, **row) for number, row in enumerate(rows)
+        )
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                break
+            model._base_manager.bulk_create(batch)
+            count += len(batch)
+        self.stdout.write(f"{count} rows of '{model._meta.db_table}'.")
+        return range(start, start + count)
+
+    def create_users(self, number):
+        password = make_password(None)
+        prefix = self.random.getrandbits(32)
+        return self.create_rows(
+            User,
+            (
+                {
+                    "username": f"bench-{prefix}-{index}",
+                    "email": f"bench-{prefix}-{index}@yamdb.fake",
+                    "password": password,
+                }
+                for index in range(number)
+            ),
+        )
+
+    def create_titles(self, number, categories, genres, max_genres):
+        titles = self.create_rows(
+            Title,
+            (
+                {
+                    "name": f"Title {index}",
+                    "year": self.random.randint(1900, 2022),
+                    "description": f"Description of the title {index}",
+                    "category_id": self.random.choice(categories),
+                }
+                for index in range(number)
+            ),
+        )
+        self.create_rows(
+            Title.genre.through,
+            (
+                {"title_id": title, "genre_id": genre}
+                for title in titles
+                for genre in self.random.sample(
+                    genres,
+                    self.random.randint(1, min(max_genres, len(genres))),
+                )
+            ),
+        )
+        return titles
+
+    def create_reviews(self, number, titles, users, exponent):
+        """Create reviews, hot titles first: one review per title author."""
+        counts = self.zipf_counts(
+            number, len(titles), exponent, limit=len(users)
+        )
+        return self.create_rows(
+            Review,
+            (
+                {
+                    "title_id": title,
+                    "author_id": author,
+                    "text": f"Review of the title {title}",
+                    "score": self.random.randint(1, 10),
+                }
+                for title, count in zip(titles, counts)
+                for author in self.random.sample(users, count)
+            ),
+        )
+
+    def create_comments(self, number, reviews, users, exponent):
+        """Create comments of the first reviews, the hot titles ones.
+
+        Ranks past the number of comments would get none, so only that
+        many reviews share them.
+        """
+        reviews = reviews[:number]
+        counts = self.zipf_counts(number, len(reviews), exponent)
+        self.create_rows(
+            Comment,
+            (
+                {
+                    "review_id": review,
+                    "author_id": self.random.choice(users),
+                    "text": f"Comment to the review {review}",
+                }
+                for review, count in zip(reviews, counts)
+                for _ in range(count)
+            ),
+        )
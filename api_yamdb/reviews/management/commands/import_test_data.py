@@ -3,24 +3,257 @@
 import csv
 import os.path
 import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 
 from django.core import management
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.utils import timezone
 
 from api_yamdb import settings
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+IMPORT_MODELS = (
+    User,
+    Category,
+    Genre,
+    Title,
+    Title.genre.through,
+    Review,
+    Comment,
+)
+
+BATCH_SIZE = 1000
 
 
 class Command(BaseCommand):
     """Import test data in database."""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of rows inserted by one query.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help=(
+                "Number of tables loaded concurrently, each in its own "
+                "transaction: unlike one worker the import is not atomic. "
+                "SQLite always uses one worker."
+            ),
+        )
+        parser.add_argument(
+            "--upsert",
+            action="store_true",
+            help=(
+                "Keep existing rows: insert new rows and update changed "
+                "ones by id, skip unchanged ones."
+            ),
+        )
+
     def handle(self, *args, **options):
-        management.call_command('migrate')
-        fill_test_data(self)
+        management.call_command("migrate")
+        workers = options["workers"]
+        if workers > 1 and connection.vendor == "sqlite":
+            self.stdout.write("SQLite allows one writer, workers set to 1.")
+            workers = 1
+        if workers > 1:
+            fill_test_data_parallel(
+                self, options["batch_size"], workers, options["upsert"]
+            )
+        else:
+            fill_test_data(self, options["batch_size"], options["upsert"])
+        management.call_command("recompute_ratings")
         self.stdout.write("All test data loaded success.")
 
 
-def fill_table_from_csv(self, db, cursor, filename):
-    """Clear table and fill data."""
+def get_dependencies(models_set):
+    """Map every model to the models of the set it refers to by FK."""
+    return {
+        model: {
+            field.related_model
+            for field in model._meta.concrete_fields
+            if field.is_relation
+            and field.related_model in models_set
+            and field.related_model is not model
+        }
+        for model in models_set
+    }
+
+
+def sort_models(models_set):
+    """Order models so that every model goes after the models it refers."""
+    dependencies = get_dependencies(models_set)
+    ordered = []
+    while len(ordered) < len(models_set):
+        ready = [
+            model
+            for model in models_set
+            if model not in ordered and dependencies[model] <= set(ordered)
+        ]
+        if not ready:
+            raise ValueError("Circular dependency between imported tables.")
+        ordered.extend(ready)
+    return ordered
+
+
+def get_converter(field):
+    """Return func turning a csv cell into a python value of the field."""
+
+    def convert(value):
+        if value == "" and field.null:
+            return None
+        value = field.to_python(value)
+        if (
+            isinstance(field, models.DateTimeField)
+            and settings.USE_TZ
+            and timezone.is_naive(value)
+        ):
+            value = timezone.make_aware(value, timezone.utc)
+        return value
+
+    return convert
+
+
+def read_rows(reader, fields):
+    """Yield rows of the csv file as python values of the fields."""
+    converters = [get_converter(field) for field in fields]
+    for row in reader:
+        yield tuple(convert(value) for convert, value in zip(converters, row))
+
+
+def prepare_row(fields, row, defaults=()):
+    """Turn python values of the row into db values."""
+    return [
+        field.get_db_prep_save(value, connection)
+        for field, value in zip(fields, row)
+    ] + list(defaults)
+
+
+def supports_on_conflict():
+    if connection.vendor == "sqlite":
+        return sqlite3.sqlite_version_info >= (3, 24, 0)
+    return connection.vendor == "postgresql"
+
+
+def get_insert_query(model, fields):
+    quote = connection.ops.quote_name
+    return "INSERT INTO {} ({}) VALUES ({})".format(
+        quote(model._meta.db_table),
+        ",".join(quote(field.column) for field in fields),
+        ",".join(["%s"] * len(fields)),
+    )
+
+
+def is_auto_now(field):
+    return getattr(field, "auto_now", False)
+
+
+def get_default(field):
+    if field.has_default():
+        return field.get_default()
+    return timezone.now()
+
+
+def get_upsert_query(model, fields, default_fields):
+    """Build INSERT query updating the csv columns of an existing row."""
+    quote = connection.ops.quote_name
+    query = get_insert_query(model, fields + default_fields)
+    pk_column = quote(model._meta.pk.column)
+    updated = [
+        quote(field.column)
+        for field in fields + default_fields
+        if not field.primary_key
+        and (field in fields or is_auto_now(field))
+    ]
+    if not updated:
+        return f"{query} ON CONFLICT ({pk_column}) DO NOTHING"
+    return "{} ON CONFLICT ({}) DO UPDATE SET {}".format(
+        query,
+        pk_column,
+        ",".join(f"{column} = excluded.{column}" for column in updated),
+    )
+
+
+def get_update_query(model, fields):
+    quote = connection.ops.quote_name
+    return "UPDATE {} SET {} WHERE {} = %s".format(
+        quote(model._meta.db_table),
+        ",".join(f"{quote(field.column)} = %s" for field in fields),
+        quote(model._meta.pk.column),
+    )
+
+
+def get_changed_rows(model, fields, batch):
+    """Split rows of the batch into new and changed ones, drop unchanged.
+
+    A row is unchanged if its content equals the stored row with the same
+    id, so only the deltas are written.
+    """
+    pk_index = fields.index(model._meta.pk)
+    stored = {
+        row[pk_index]: row
+        for row in model._base_manager.filter(
+            pk__in=[row[pk_index] for row in batch]
+        ).values_list(*[field.attname for field in fields])
+    }
+    new = [row for row in batch if row[pk_index] not in stored]
+    changed = [
+        row
+        for row in batch
+        if row[pk_index] in stored and stored[row[pk_index]] != row
+    ]
+    return new, changed
+
+
+def upsert_rows(cursor, model, fields, default_fields, defaults, batch):
+    """Write new and changed rows of the batch, return their number."""
+    new, changed = get_changed_rows(model, fields, batch)
+    if supports_on_conflict():
+        cursor.executemany(
+            get_upsert_query(model, fields, default_fields),
+            [prepare_row(fields, row, defaults) for row in new + changed],
+        )
+        return len(new) + len(changed)
+    cursor.executemany(
+        get_insert_query(model, fields + default_fields),
+        [prepare_row(fields, row, defaults) for row in new],
+    )
+    pk_index = fields.index(model._meta.pk)
+    updated = [field for field in fields if not field.primary_key]
+    auto_now_fields = [field for field in default_fields if is_auto_now(field)]
+    if updated and changed:
+        cursor.executemany(
+            get_update_query(model, updated + auto_now_fields),
+            [
+                prepare_row(
+                    updated + auto_now_fields + [model._meta.pk],
+                    row[:pk_index]
+                    + row[pk_index + 1:]
+                    + tuple(map(get_default, auto_now_fields))
+                    + (row[pk_index],),
+                )
+                for row in changed
+            ],
+        )
+    return len(new) + len(changed)
+
+
+def fill_table_from_csv(self, cursor, model, batch_size, upsert=False):
+    """Fill the table with data of the csv file by batches.
+
+    In the upsert mode only new and changed rows are written.
+    """
+    table = model._meta.db_table
+    filename = f"{table}.csv"
     try:
         csv_data = open(
             os.path.join(settings.STATICFILES_DIRS_DATA, filename),
@@ -29,27 +262,133 @@ def fill_table_from_csv(self, db, cursor, filename):
         )
     except IOError:
         self.stdout.write(f"File '{filename}' open error.")
-        return
-    table = filename.split(".")[0]
-    cursor.execute(f"DELETE FROM {table}")
-    dr = csv.DictReader(csv_data, delimiter=";")
-    values = []
-    for i in dr:
-        keys = ",".join(i.keys())
-        values.append(tuple(i.values()))
-    fields = ",".join("?" * len(values[0]))
-    cursor.executemany(
-        f"INSERT INTO {table} ({keys}) VALUES ({fields})", values
-    )
-    db.commit()
+        return 0
+    with csv_data:
+        reader = csv.reader(csv_data, delimiter=";")
+        fields = [model._meta.get_field(column) for column in next(reader)]
+        default_fields = [
+            field
+            for field in model._meta.concrete_fields
+            if field not in fields
+            and (
+                field.has_default()
+                or is_auto_now(field)
+                or getattr(field, "auto_now_add", False)
+            )
+        ]
+        defaults = [
+            field.get_db_prep_save(get_default(field), connection)
+            for field in default_fields
+        ]
+        query = get_insert_query(model, fields + default_fields)
+        rows = read_rows(reader, fields)
+        total = written = 0
+        start = time.monotonic()
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            total += len(batch)
+            if upsert:
+                written += upsert_rows(
+                    cursor, model, fields, default_fields, defaults, batch
+                )
+                continue
+            cursor.executemany(
+                query, [prepare_row(fields, row, defaults) for row in batch]
+            )
+            written += len(batch)
+        elapsed = time.monotonic() - start
     self.stdout.write(
-        f"Data from file '{filename}' imported in table '{table}'."
+        f"Data from file '{filename}' imported in table '{table}': "
+        f"{total} rows, {written} written, "
+        f"{total / max(elapsed, 1e-6):.0f} rows/sec."
     )
+    return written
+
+
+def clear_tables(cursor, models_set):
+    """Delete rows of the tables, children before parents."""
+    for model in reversed(sort_models(models_set)):
+        cursor.execute(
+            f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)}"
+        )
+
+
+def reset_sequences(cursor, models_set):
+    for sql in connection.ops.sequence_reset_sql(no_style(), models_set):
+        cursor.execute(sql)
+
+
+def fill_test_data(self, batch_size=BATCH_SIZE, upsert=False):
+    """Clear tables and fill them with data in one transaction."""
+    tables = [model._meta.db_table for model in IMPORT_MODELS]
+    with transaction.atomic():
+        with connection.constraint_checks_disabled():
+            with connection.cursor() as cursor:
+                if not upsert:
+                    clear_tables(cursor, IMPORT_MODELS)
+                for model in sort_models(IMPORT_MODELS):
+                    fill_table_from_csv(
+                        self, cursor, model, batch_size, upsert
+                    )
+                reset_sequences(cursor, IMPORT_MODELS)
+        connection.check_constraints(table_names=tables)
+
+
+def fill_table_in_thread(self, model, batch_size, upsert):
+    """Fill one table in its own transaction of the worker thread."""
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                fill_table_from_csv(self, cursor, model, batch_size, upsert)
+    finally:
+        connection.close()
+
 
+def fill_test_data_parallel(self, batch_size, workers, upsert=False):
+    """Fill independent tables concurrently, parents before children.
 
-def fill_test_data(self):
-    """Iterate for all tables, call funcs to prepare and fill data in db."""
-    db = sqlite3.connect(os.path.join(settings.BASE_DIR, "db.sqlite3"))
-    cursor = db.cursor()
-    for filename in os.listdir(settings.STATICFILES_DIRS_DATA):
-        fill_table_from_csv(self, db, cursor, filename)
+    Unlike 'fill_test_data' the load is not atomic: the tables are
+    cleared and every table is committed by its own transaction. If a
+    table fails, tables not started yet are skipped and CommandError
+    names the failed table; the tables loaded before stay committed, so
+    the import should be run again.
+    """
+    tables = [model._meta.db_table for model in IMPORT_MODELS]
+    if not upsert:
+        with transaction.atomic(), connection.cursor() as cursor:
+            clear_tables(cursor, IMPORT_MODELS)
+    dependencies = get_dependencies(IMPORT_MODELS)
+    done = set()
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while len(done) < len(IMPORT_MODELS):
+            for model in IMPORT_MODELS:
+                if (
+                    model not in done
+                    and model not in running.values()
+                    and dependencies[model] <= done
+                ):
+                    future = executor.submit(
+                        fill_table_in_thread, self, model, batch_size, upsert
+                    )
+                    running[future] = model
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                model = running.pop(future)
+                if future.exception() is not None:
+                    wait(running)
+                    loaded = ", ".join(
+                        sorted(item._meta.db_table for item in done)
+                    )
+                    raise CommandError(
+                        f"Loading of table '{model._meta.db_table}' failed, "
+                        f"loaded tables: {loaded or 'none'}. "
+                        "Run the import again."
+                    ) from future.exception()
+                done.add(model)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            reset_sequences(cursor, IMPORT_MODELS)
+        connection.check_constraints(table_names=tables)
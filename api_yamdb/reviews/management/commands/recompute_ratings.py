@@ -0,0 +1,85 @@
+"""Recalculate the stored ratings of titles from their reviews."""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from reviews.models import Review, Title
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    """Repair drift of 'rating_sum', 'rating_count' and 'rating' fields."""
+
+    help = "Recalculate the stored ratings of titles from their reviews."
+
+    def handle(self, *args, **options):
+        fixed = recompute_ratings()
+        self.stdout.write(f"Ratings recomputed, {fixed} titles fixed.")
+
+
+def recompute_ratings(queryset=None):
+    """Recalculate ratings of the titles, return number of fixed titles."""
+    if queryset is None:
+        queryset = Title.objects.all()
+    reviews = (
+        Review.objects.filter(title=OuterRef("pk"))
+        .order_by()
+        .values("title")
+    )
+    actual_sum = Coalesce(
+        Subquery(
+            reviews.annotate(total=Sum("score")).values("total"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+    actual_count = Coalesce(
+        Subquery(
+            reviews.annotate(total=Count("id")).values("total"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+    with transaction.atomic():
+        drifted = (
+            queryset.annotate(
+                actual_sum=actual_sum, actual_count=actual_count
+            )
+            .filter(
+                ~Q(rating_sum=F("actual_sum"))
+                | ~Q(rating_count=F("actual_count"))
+            )
+            .values_list("pk", flat=True)
+        )
+        drifted = list(drifted)
+        for start in range(0, len(drifted), BATCH_SIZE):
+            Title.objects.filter(
+                pk__in=drifted[start:start + BATCH_SIZE]
+            ).update(
+                rating_sum=actual_sum,
+                rating_count=actual_count,
+                modified=timezone.now(),
+            )
+        queryset.update(
+            rating=Case(
+                When(rating_count=0, then=Value(None)),
+                default=F("rating_sum") / F("rating_count"),
+                output_field=IntegerField(),
+            )
+        )
+    return len(drifted)
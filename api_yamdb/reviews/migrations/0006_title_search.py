@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-18 21:02
+
+from django.db import migrations
+
+from reviews.search import TITLE_INDEX
+
+
+def install_search(apps, schema_editor):
+    TITLE_INDEX.install(schema_editor.connection)
+
+
+def uninstall_search(apps, schema_editor):
+    TITLE_INDEX.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_modified'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.28 on 2026-10-18 21:40
+
+from django.db import migrations
+
+from reviews.search import COMMENT_INDEX, REVIEW_INDEX
+
+
+def install_search(apps, schema_editor):
+    for index in (REVIEW_INDEX, COMMENT_INDEX):
+        index.install(schema_editor.connection)
+
+
+def uninstall_search(apps, schema_editor):
+    for index in (REVIEW_INDEX, COMMENT_INDEX):
+        index.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
@@ -87,9 +87,33 @@ class Title(models.Model):
         verbose_name="Category",
         help_text="Select a category",
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Sum of review scores",
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Number of reviews",
+    )
+    rating = models.PositiveSmallIntegerField(
+        null=True,
+        editable=False,
+        db_index=True,
+        verbose_name="Rating",
+    )
+    modified = models.DateTimeField(
+        auto_now=True, verbose_name="Modification date"
+    )
 
     class Meta:
         ordering = ("name",)
+        indexes = (
+            models.Index(
+                fields=("category", "year"), name="title_category_year_idx"
+            ),
+        )
         verbose_name = "title"
         verbose_name_plural = "titles"
 
@@ -125,6 +149,9 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         verbose_name="Review date", auto_now_add=True, db_index=True
     )
+    modified = models.DateTimeField(
+        auto_now=True, verbose_name="Modification date"
+    )
 
     class Meta:
         ordering = ("pub_date",)
@@ -139,6 +166,12 @@ class Review(models.Model):
     def __str__(self):
         return self.text[: settings.NUM_CHAR]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get("score")
+        return instance
+
 
 class Comment(models.Model):
     """'Comment' resource table settings."""
@@ -160,6 +193,9 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         verbose_name="Comment date", auto_now_add=True, db_index=True
     )
+    modified = models.DateTimeField(
+        auto_now=True, verbose_name="Modification date"
+    )
 
     class Meta:
         ordering = ("pub_date",)
@@ -0,0 +1,251 @@
+"""Full-text search over text columns of the 'Reviews' application.
+
+SQLite gets an external content FTS5 table kept in sync by triggers,
+PostgreSQL gets a GIN index over the 'tsvector' of the columns. Triggers
+and expression indexes follow every write, including bulk inserts and raw
+SQL of the data import. On other databases, or SQLite built without FTS5,
+the search falls back to 'icontains' lookups.
+"""
+
+import logging
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connections, utils
+from django.db.models import Q
+from django.utils.html import escape
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Marks of the found words in snippets and the size of snippets in words.
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+ELLIPSIS = "…"
+SNIPPET_WORDS = 16
+
+
+def get_tokens(query):
+    return TOKEN_RE.findall(query)
+
+
+def get_snippet(text, query):
+    """Return the fragment of the text around the first found word.
+
+    The text is HTML-escaped and the words starting with the words of
+    the query are wrapped in the highlight marks, so the snippet is safe
+    to show as HTML whatever the users wrote.
+    """
+    prefixes = tuple(token.lower() for token in get_tokens(query))
+    words = list(TOKEN_RE.finditer(text))
+    found = [
+        bool(prefixes) and word.group().lower().startswith(prefixes)
+        for word in words
+    ]
+    first = found.index(True) if True in found else 0
+    start = max(0, min(first - SNIPPET_WORDS // 4, len(words) - SNIPPET_WORDS))
+    end = min(len(words), start + SNIPPET_WORDS)
+    parts = [ELLIPSIS] if start else []
+    position = words[start].start() if start else 0
+    for word, is_found in zip(words[start:end], found[start:end]):
+        parts.append(escape(text[position:word.start()]))
+        if is_found:
+            parts += [HIGHLIGHT_START, escape(word.group()), HIGHLIGHT_END]
+        else:
+            parts.append(escape(word.group()))
+        position = word.end()
+    if end < len(words):
+        parts.append(ELLIPSIS)
+    else:
+        parts.append(escape(text[position:]))
+    return "".join(parts)
+
+
+class SearchIndex:
+    """Full-text index over the columns of the table."""
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = columns
+        self.fts_table = f"{table}_fts"
+        self.triggers = tuple(
+            f"{self.fts_table}_{event}"
+            for event in ("insert", "delete", "update")
+        )
+        self._available = {}
+
+    def get_sqlite_ddl(self):
+        columns = ", ".join(self.columns)
+        new = ", ".join(f"new.{column}" for column in self.columns)
+        old = ", ".join(f"old.{column}" for column in self.columns)
+        insert = (
+            f"INSERT INTO {self.fts_table}(rowid, {columns}) "
+            f"VALUES (new.id, {new});"
+        )
+        delete = (
+            f"INSERT INTO {self.fts_table}({self.fts_table}, rowid, "
+            f"{columns}) VALUES ('delete', old.id, {old});"
+        )
+        insert_trigger, delete_trigger, update_trigger = self.triggers
+        return (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.fts_table} "
+            f"USING fts5({columns}, content='{self.table}', "
+            f"content_rowid='id')",
+            f"CREATE TRIGGER IF NOT EXISTS {insert_trigger} "
+            f"AFTER INSERT ON {self.table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {delete_trigger} "
+            f"AFTER DELETE ON {self.table} BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {update_trigger} "
+            f"AFTER UPDATE OF {columns} ON {self.table} "
+            f"BEGIN {delete} {insert} END",
+        )
+
+    def get_vector_sql(self, connection, qualified=True):
+        quote = connection.ops.quote_name
+        prefix = f"{quote(self.table)}." if qualified else ""
+        document = " || ' ' || ".join(
+            f"coalesce({prefix}{quote(column)}, '')"
+            for column in self.columns
+        )
+        return f"to_tsvector('simple', {document})"
+
+    def install(self, connection):
+        """Create the index, fill it if it was missing or out of sync.
+
+        Safe to call repeatedly: it is run by the migration and after
+        every 'migrate', since rebuilding the table on SQLite drops its
+        triggers.
+        """
+        self._available.clear()
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self.table}_search_idx "
+                    f"ON {self.table} USING GIN "
+                    f"(({self.get_vector_sql(connection, False)}))"
+                )
+            elif connection.vendor == "sqlite":
+                cursor.execute(
+                    "SELECT count(*) FROM sqlite_master "
+                    "WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+                    self.triggers,
+                )
+                if cursor.fetchone()[0] == len(self.triggers):
+                    return
+                try:
+                    for sql in self.get_sqlite_ddl():
+                        cursor.execute(sql)
+                except utils.OperationalError:
+                    logger.warning(
+                        "SQLite has no FTS5, search over %s falls back "
+                        "to 'icontains'.",
+                        self.table,
+                    )
+                    return
+                cursor.execute(
+                    f"INSERT INTO {self.fts_table}({self.fts_table}) "
+                    "VALUES ('rebuild')"
+                )
+
+    def uninstall(self, connection):
+        self._available.clear()
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"DROP INDEX IF EXISTS {self.table}_search_idx")
+            elif connection.vendor == "sqlite":
+                for trigger in self.triggers:
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                cursor.execute(f"DROP TABLE IF EXISTS {self.fts_table}")
+
+    def is_available(self, connection):
+        if connection.vendor == "postgresql":
+            return True
+        if connection.vendor != "sqlite":
+            return False
+        key = (connection.alias, connection.settings_dict["NAME"])
+        if key not in self._available:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT count(*) FROM sqlite_master WHERE name = %s",
+                    (self.fts_table,),
+                )
+                self._available[key] = bool(cursor.fetchone()[0])
+        return self._available[key]
+
+    def search(self, queryset, query):
+        """Filter the queryset by the query, best matches first.
+
+        Every word of the query must be found, the last letters of the
+        words may be missing ('matr' finds 'Matrix'). Rows are annotated
+        with 'search_rank', the lower the better (not on the 'icontains'
+        fallback). Snippets of the found rows are built by 'get_snippet'.
+        """
+        tokens = get_tokens(query)
+        if not tokens:
+            return queryset.none()
+        connection = connections[queryset.db]
+        if not self.is_available(connection):
+            return self.search_fallback(queryset, tokens)
+        if connection.vendor == "postgresql":
+            select, select_params, where, params = self.get_postgresql_sql(
+                connection, tokens
+            )
+        else:
+            select, select_params, where, params = self.get_sqlite_sql(tokens)
+            queryset = queryset.extra(tables=(self.fts_table,))
+        return queryset.extra(
+            select=select,
+            select_params=select_params,
+            where=where,
+            params=params,
+        ).order_by("search_rank", "pk")
+
+    def search_fallback(self, queryset, tokens):
+        return queryset.filter(
+            reduce(
+                and_,
+                (
+                    reduce(
+                        or_,
+                        (
+                            Q(**{f"{column}__icontains": token})
+                            for column in self.columns
+                        ),
+                    )
+                    for token in tokens
+                ),
+            )
+        )
+
+    def get_postgresql_sql(self, connection, tokens):
+        expression = " & ".join(f"{token}:*" for token in tokens)
+        vector = self.get_vector_sql(connection)
+        tsquery = "to_tsquery('simple', %s)"
+        return (
+            {"search_rank": f"-ts_rank({vector}, {tsquery})"},
+            [expression],
+            (f"{vector} @@ {tsquery}",),
+            [expression],
+        )
+
+    def get_sqlite_sql(self, tokens):
+        expression = " ".join(f'"{token}"*' for token in tokens)
+        where = (
+            f"{self.fts_table}.rowid = {self.table}.id",
+            f"{self.fts_table} MATCH %s",
+        )
+        return (
+            {"search_rank": f"{self.fts_table}.rank"},
+            [],
+            where,
+            [expression],
+        )
+
+
+TITLE_INDEX = SearchIndex("reviews_title", ("name", "description"))
+REVIEW_INDEX = SearchIndex("reviews_review", ("text",))
+COMMENT_INDEX = SearchIndex("reviews_comment", ("text",))
+
+SEARCH_INDEXES = (TITLE_INDEX, REVIEW_INDEX, COMMENT_INDEX)
@@ -0,0 +1,89 @@
+"""Signal handlers of the 'Reviews' application."""
+
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import SEARCH_INDEXES
+from users.models import User
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    """Shift the stored rating aggregates of the title in one UPDATE."""
+    new_sum = F("rating_sum") + score_delta
+    new_count = F("rating_count") + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=Case(
+            When(rating_count=-count_delta, then=Value(None)),
+            default=new_sum / new_count,
+            output_field=IntegerField(),
+        ),
+        modified=timezone.now(),
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    score = int(instance.score)
+    old_score = getattr(instance, "_loaded_score", None)
+    if created:
+        update_title_rating(instance.title_id, score, 1)
+    elif old_score is not None and old_score != score:
+        update_title_rating(instance.title_id, score - old_score, 0)
+    instance._loaded_score = score
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    update_title_rating(instance.title_id, -int(instance.score), -1)
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, raw, **kwargs):
+    if not (created or raw):
+        Title.objects.filter(category=instance).update(modified=timezone.now())
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    Title.objects.filter(category=instance).update(modified=timezone.now())
+
+
+@receiver(post_save, sender=Genre)
+def genre_saved(sender, instance, created, raw, **kwargs):
+    if not (created or raw):
+        Title.objects.filter(genre=instance).update(modified=timezone.now())
+
+
+@receiver(pre_delete, sender=Genre)
+def genre_deleted(sender, instance, **kwargs):
+    Title.objects.filter(genre=instance).update(modified=timezone.now())
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw, **kwargs):
+    """Bump reviews and comments which show the changed username."""
+    old_username = getattr(instance, "_loaded_username", None)
+    if not (created or raw) and old_username != instance.username:
+        Review.objects.filter(author=instance).update(modified=timezone.now())
+        Comment.objects.filter(author=instance).update(modified=timezone.now())
+    instance._loaded_username = instance.username
+
+
+@receiver(post_migrate)
+def migrated(sender, using, **kwargs):
+    if sender.name == "reviews":
+        for index in SEARCH_INDEXES:
+            index.install(connections[using])
@@ -2,7 +2,7 @@
 
 from django.contrib import admin
 
-from users.models import User
+from users.models import OutboundEmail, User
 
 
 @admin.register(User)
@@ -21,3 +21,19 @@ class UserAdmin(admin.ModelAdmin):
     list_editable = ("role",)
     search_fields = ("username",)
     list_filter = ("role",)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """Table settings for outbound emails on the admin site."""
+
+    list_display = (
+        "pk",
+        "recipient",
+        "subject",
+        "created",
+        "sent",
+        "attempts",
+    )
+    search_fields = ("recipient",)
+    list_filter = ("sent",)
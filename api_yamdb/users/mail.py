@@ -0,0 +1,279 @@
+"""Outbox of emails: requests store emails, workers deliver them."""
+
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from users.models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+class MailMetrics:
+    """Counters of the delivery, shared by the workers of the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self.send_seconds = 0.0
+        self.max_send_seconds = 0.0
+
+    def record_send(self, seconds, ok):
+        with self._lock:
+            if ok:
+                self.sent += 1
+            else:
+                self.failed += 1
+            self.send_seconds += seconds
+            self.max_send_seconds = max(self.max_send_seconds, seconds)
+
+    def record_batch(self):
+        with self._lock:
+            self.batches += 1
+
+    def as_dict(self):
+        queue_depth = get_pending().count()
+        with self._lock:
+            sends = self.sent + self.failed
+            return {
+                "queue_depth": queue_depth,
+                "sent": self.sent,
+                "failed": self.failed,
+                "batches": self.batches,
+                "avg_send_seconds": sends and self.send_seconds / sends,
+                "max_send_seconds": self.max_send_seconds,
+            }
+
+
+metrics = MailMetrics()
+
+
+class MailDispatcher:
+    """Pool of worker threads, each keeping a long-lived mail connection.
+
+    Workers flush the outbox when EMAIL_OUTBOX_BATCH_SIZE emails were
+    queued in the process or every EMAIL_OUTBOX_FLUSH_INTERVAL seconds,
+    so bursts of signups are sent by batches.
+    """
+
+    def __init__(self, workers, batch_size, flush_interval):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queued = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for number in range(self.workers):
+            thread = threading.Thread(
+                target=self.run,
+                name=f"email-outbox-{number}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def notify(self):
+        with self._lock:
+            self._queued += 1
+            if self._queued >= self.batch_size:
+                self._wakeup.set()
+
+    def run(self):
+        mail_connection = None
+        try:
+            while not self._stopped.is_set():
+                self._wakeup.wait(self.flush_interval)
+                with self._lock:
+                    self._queued = 0
+                    self._wakeup.clear()
+                try:
+                    if mail_connection is None:
+                        mail_connection = get_connection(fail_silently=False)
+                        mail_connection.open()
+                    failed = send_pending(self.batch_size, mail_connection)[1]
+                except Exception:
+                    logger.exception("Email outbox flush failed.")
+                    connection.close()
+                    failed = True
+                if failed and mail_connection is not None:
+                    # The connection may be broken: reopen it next time.
+                    mail_connection.close()
+                    mail_connection = None
+        finally:
+            if mail_connection is not None:
+                mail_connection.close()
+            connection.close()
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = MailDispatcher(
+                settings.EMAIL_OUTBOX_WORKERS,
+                settings.EMAIL_OUTBOX_BATCH_SIZE,
+                settings.EMAIL_OUTBOX_FLUSH_INTERVAL,
+            )
+            _dispatcher.start()
+    return _dispatcher
+
+
+def queue_email(subject, message, recipient):
+    """Store the email in the outbox, deliver it after the commit."""
+    email = OutboundEmail.objects.create(
+        subject=subject, message=message, recipient=recipient
+    )
+    transaction.on_commit(dispatch)
+    return email
+
+
+def dispatch():
+    """Deliver pending emails according to the outbox settings.
+
+    Eager mode sends them in the current thread, otherwise they are sent
+    by the dispatcher of the process. With no workers they wait for the
+    'send_emails' command.
+    """
+    if settings.EMAIL_OUTBOX_EAGER:
+        send_pending()
+    elif settings.EMAIL_OUTBOX_WORKERS:
+        get_dispatcher().notify()
+
+
+def get_pending():
+    """Emails waiting for delivery and not claimed by a live worker."""
+    claim_expired = timezone.now() - timedelta(
+        seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT
+    )
+    return OutboundEmail.objects.filter(
+        Q(claimed__isnull=True) | Q(claimed__lt=claim_expired),
+        sent__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    )
+
+
+def claim_batch(batch_size, after_id=0):
+    """Claim pending emails with ids greater than 'after_id'.
+
+    The attempt is counted by the claim. The UPDATE checks again that the
+    emails are pending, so of concurrent workers only one claims an email.
+    A claim of a worker which died while sending expires after
+    EMAIL_OUTBOX_CLAIM_TIMEOUT seconds.
+    """
+    token = uuid.uuid4().hex
+    with transaction.atomic():
+        ids = list(
+            get_pending()
+            .filter(id__gt=after_id)
+            .select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        get_pending().filter(pk__in=ids).update(
+            claimed=timezone.now(),
+            claim_token=token,
+            attempts=F("attempts") + 1,
+        )
+    return ids, list(OutboundEmail.objects.filter(claim_token=token))
+
+
+def send_messages(mail_connection, emails):
+    """Send the emails through the open connection.
+
+    Return ids of sent emails and ids of failed emails by the error. The
+    messages are passed one by one, since 'send_messages' of a list stops
+    at the first error without telling which messages went out.
+    """
+    sent_ids = []
+    errors = defaultdict(list)
+    for email in emails:
+        message = EmailMessage(
+            subject=email.subject,
+            body=email.message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=(email.recipient,),
+            connection=mail_connection,
+        )
+        start = time.monotonic()
+        try:
+            mail_connection.send_messages([message])
+        except Exception as error:
+            metrics.record_send(time.monotonic() - start, ok=False)
+            errors[str(error)].append(email.pk)
+        else:
+            metrics.record_send(time.monotonic() - start, ok=True)
+            sent_ids.append(email.pk)
+    return sent_ids, errors
+
+
+def send_batch(mail_connection, batch_size, after_id=0):
+    """Send one batch of pending emails with ids greater than 'after_id'.
+
+    Return numbers of sent and failed emails and the last id of the batch.
+    The batch is claimed and its results are stored by short transactions,
+    the mail server is talked to outside of them, so the database is not
+    locked for the sending and a failure does not undo marks of emails
+    which went out. An email is sent again only if the worker dies
+    between sending it and storing the result.
+    """
+    ids, emails = claim_batch(batch_size, after_id)
+    if not ids:
+        return 0, 0, None
+    sent_ids, errors = send_messages(mail_connection, emails)
+    with transaction.atomic():
+        OutboundEmail.objects.filter(pk__in=sent_ids).update(
+            sent=timezone.now(), claimed=None, claim_token=""
+        )
+        for error, failed_ids in errors.items():
+            OutboundEmail.objects.filter(pk__in=failed_ids).update(
+                last_error=error, claimed=None, claim_token=""
+            )
+    metrics.record_batch()
+    return len(sent_ids), len(emails) - len(sent_ids), ids[-1]
+
+
+def send_pending(batch_size=None, mail_connection=None):
+    """Pass the outbox once by batches, return numbers of sent and failed.
+
+    Without 'mail_connection' one connection is opened for the pass.
+    Failed emails stay in the outbox until EMAIL_OUTBOX_MAX_ATTEMPTS.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    if mail_connection is None:
+        with get_connection(fail_silently=False) as mail_connection:
+            return send_pending(batch_size, mail_connection)
+    total_sent = total_failed = 0
+    last_id = 0
+    while last_id is not None:
+        sent, failed, last_id = send_batch(
+            mail_connection, batch_size, last_id
+        )
+        total_sent += sent
+        total_failed += failed
+    return total_sent, total_failed
@@ -0,0 +1,41 @@
+"""Deliver emails waiting in the outbox."""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.mail import send_pending
+
+
+class Command(BaseCommand):
+    """Drain the outbox once or keep polling it."""
+
+    help = "Deliver emails waiting in the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help="Number of emails sent by one batch.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.EMAIL_OUTBOX_FLUSH_INTERVAL,
+            help="Seconds between polls of the outbox in the loop mode.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_pending(options["batch_size"])
+            self.stdout.write(f"{sent} emails sent, {failed} failed.")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
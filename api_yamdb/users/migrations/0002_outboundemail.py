@@ -0,0 +1,31 @@
+# Generated by Django 2.2.28 on 2026-10-18 20:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='Recipient')),
+                ('subject', models.CharField(max_length=256, verbose_name='Subject')),
+                ('message', models.TextField(verbose_name='Message')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Creation date')),
+                ('sent', models.DateTimeField(db_index=True, null=True, verbose_name='Sending date')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Sending attempts')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last sending error')),
+            ],
+            options={
+                'verbose_name': 'outbound email',
+                'verbose_name_plural': 'outbound emails',
+                'ordering': ('id',),
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-18 20:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_outboundemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboundemail',
+            name='claim_token',
+            field=models.CharField(blank=True, db_index=True, max_length=32, verbose_name='Claim token'),
+        ),
+        migrations.AddField(
+            model_name='outboundemail',
+            name='claimed',
+            field=models.DateTimeField(null=True, verbose_name='Claiming date'),
+        ),
+    ]
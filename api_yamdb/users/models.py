@@ -29,6 +29,12 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_username = instance.__dict__.get("username")
+        return instance
+
     @property
     def is_moderator(self):
         return self.role == self.MODERATOR
@@ -36,3 +42,29 @@ class User(AbstractUser):
     @property
     def is_admin(self):
         return self.role == self.ADMIN or self.is_staff or self.is_superuser
+
+
+class OutboundEmail(models.Model):
+    """Email waiting for delivery by the outbox worker."""
+
+    recipient = models.EmailField("Recipient")
+    subject = models.CharField("Subject", max_length=256)
+    message = models.TextField("Message")
+    created = models.DateTimeField("Creation date", auto_now_add=True)
+    sent = models.DateTimeField("Sending date", null=True, db_index=True)
+    attempts = models.PositiveSmallIntegerField(
+        "Sending attempts", default=0
+    )
+    last_error = models.TextField("Last sending error", blank=True)
+    claimed = models.DateTimeField("Claiming date", null=True)
+    claim_token = models.CharField(
+        "Claim token", max_length=32, blank=True, db_index=True
+    )
+
+    class Meta:
+        ordering = ("id",)
+        verbose_name = "outbound email"
+        verbose_name_plural = "outbound emails"
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient}"
@@ -0,0 +1,170 @@
+"""Load benchmark of the key API endpoints.
+
+Generate the dataset first, e.g.:
+    python api_yamdb/manage.py generate_benchmark_data --clear \
+        --titles 100000 --reviews 10000000 --users 50000
+Run from the repository root:
+    python benchmarks/bench_api.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_api.py --baseline benchmarks/baseline.json
+Targets are drawn from the '--seed' random generator and the users,
+reviews and emails created by the run are deleted after it, so runs
+over the same dataset are comparable.
+"""
+
+import argparse
+import itertools
+import random
+
+from common import load, measure, report, save, setup_django
+
+# Prefix of usernames of the users created by the run.
+PREFIX = "bench-run"
+
+
+def clean_up():
+    """Delete the users of the run with their reviews and emails.
+
+    Ratings of the titles are restored by the signals of deleted reviews,
+    so the next run starts from the same dataset.
+    """
+    from users.models import OutboundEmail, User
+
+    User.objects.filter(username__startswith=PREFIX).delete()
+    OutboundEmail.objects.filter(recipient__startswith=PREFIX).delete()
+
+
+def get_scenarios(rng):
+    from django.contrib.auth.tokens import default_token_generator
+    from django.db.models import Count
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from reviews.models import Genre, Review, Title
+    from users.models import User
+
+    reader = User.objects.create(
+        username=f"{PREFIX}-reader", email=f"{PREFIX}-reader@yamdb.fake"
+    )
+    client = APIClient()
+    # Authenticated requests bypass the response cache.
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(reader)}"
+    )
+    anonymous = APIClient()
+    genres = list(Genre.objects.values_list("slug", flat=True))
+    if not genres:
+        raise SystemExit("No data, run 'generate_benchmark_data' first.")
+    hot_titles = list(
+        Title.objects.order_by("-rating_count").values_list(
+            "id", "rating_count"
+        )[:10]
+    )
+    hot_reviews = list(
+        Review.objects.annotate(comments_count=Count("comments"))
+        .order_by("-comments_count")
+        .values_list("title_id", "id", "comments_count")[:10]
+    )
+    title_ids = list(Title.objects.order_by("id").values_list("id", flat=True))
+    new_titles = iter(rng.sample(title_ids, len(title_ids)))
+    counter = itertools.count()
+
+    def title_list():
+        params = {"genre": rng.choice(genres)}
+        if rng.random() < 0.5:
+            params["year"] = rng.randint(1900, 2022)
+        return client.get("/api/v1/titles/", params)
+
+    def anonymous_title_list():
+        return anonymous.get(
+            "/api/v1/titles/", {"genre": rng.choice(genres)}
+        )
+
+    def review_list():
+        title_id, count = rng.choice(hot_titles)
+        page = rng.randint(1, max(1, count // 4))
+        return client.get(
+            f"/api/v1/titles/{title_id}/reviews/", {"page": page}
+        )
+
+    def review_list_cursor():
+        return client.get(
+            f"/api/v1/titles/{rng.choice(hot_titles)[0]}/reviews/",
+            {"cursor": "", "page_size": 20},
+        )
+
+    def comment_list():
+        title_id, review_id, _ = rng.choice(hot_reviews)
+        return client.get(
+            f"/api/v1/titles/{title_id}/reviews/{review_id}/comments/"
+        )
+
+    def signup_token():
+        username = f"{PREFIX}-{next(counter)}"
+        data = {"username": username, "email": f"{username}@yamdb.fake"}
+        anonymous.post("/api/v1/auth/signup/", data)
+        user = User.objects.get(username=username)
+        return anonymous.post(
+            "/api/v1/auth/token/",
+            {
+                "username": username,
+                "confirmation_code": default_token_generator.make_token(user),
+            },
+        )
+
+    def review_create():
+        return client.post(
+            f"/api/v1/titles/{next(new_titles)}/reviews/",
+            {"text": "Benchmark review", "score": rng.randint(1, 10)},
+        )
+
+    return [
+        ("titles-list", title_list),
+        ("reviews-list", review_list),
+        ("reviews-list-cursor", review_list_cursor),
+        ("comments-list", comment_list),
+        ("titles-list-anonymous", anonymous_title_list),
+        ("signup-token", signup_token),
+        ("review-create", review_create),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", help="JSON file to compare with.")
+    parser.add_argument("--save-baseline", help="JSON file to save to.")
+    args = parser.parse_args()
+    setup_django()
+
+    from django.conf import settings
+    from django.test.utils import override_settings
+
+    with override_settings(
+        DEBUG=False,
+        MIDDLEWARE=[
+            middleware
+            for middleware in settings.MIDDLEWARE
+            if not middleware.startswith("debug_toolbar")
+        ],
+        EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+        EMAIL_OUTBOX_WORKERS=0,
+        EMAIL_OUTBOX_EAGER=False,
+    ):
+        rng = random.Random(args.seed)
+        # Also removes what an interrupted run left.
+        clean_up()
+        try:
+            results = [
+                measure(name, call, args.requests)
+                for name, call in get_scenarios(rng)
+            ]
+        finally:
+            clean_up()
+    report(results, args.baseline and load(args.baseline))
+    if args.save_baseline:
+        save(args.save_baseline, results)
+
+
+if __name__ == "__main__":
+    main()
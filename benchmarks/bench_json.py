@@ -0,0 +1,93 @@
+"""Benchmark of the JSON renderers and parsers of the API.
+
+Compares DRF's stdlib-based 'JSONRenderer'/'JSONParser' with
+'FastJSONRenderer'/'FastJSONParser' on a payload shaped like a page
+of the title list. Run from the repository root:
+    python benchmarks/bench_json.py --titles 100
+"""
+
+import argparse
+import datetime
+import io
+import timeit
+
+from common import setup_django
+
+
+def get_payload(titles):
+    from django.utils import timezone
+
+    pub_date = datetime.datetime(2022, 12, 20, 20, 11, tzinfo=timezone.utc)
+    return {
+        "count": titles,
+        "next": "http://testserver/api/v1/titles/?page=2",
+        "previous": None,
+        "results": [
+            {
+                "id": number,
+                "name": f"Произведение {number}",
+                "year": 1900 + number % 120,
+                "rating": number % 10 + 1,
+                "description": "Описание произведения. " * 10,
+                "genre": [
+                    {"name": f"Жанр {genre}", "slug": f"genre-{genre}"}
+                    for genre in range(number % 4 + 1)
+                ],
+                "category": {"name": "Фильм", "slug": "movie"},
+                "modified": pub_date,
+            }
+            for number in range(titles)
+        ],
+    }
+
+
+def measure(call, number, repeat):
+    """Best time of one call in microseconds."""
+    times = timeit.repeat(call, number=number, repeat=repeat)
+    return min(times) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--titles", type=int, default=100)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    setup_django()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.v1.parsers import FastJSONParser
+    from api.v1.renderers import FastJSONRenderer, orjson
+
+    if orjson is None:
+        print("'orjson' is not installed, both classes use 'json'.")
+    payload = get_payload(args.titles)
+    content = JSONRenderer().render(payload)
+    print(f"payload: {args.titles} titles, {len(content)} bytes")
+    print(
+        f"{'operation':<12}{'stdlib, us':>14}{'fast, us':>14}{'speedup':>10}"
+    )
+    for operation, default, fast in (
+        (
+            "render",
+            lambda: JSONRenderer().render(payload),
+            lambda: FastJSONRenderer().render(payload),
+        ),
+        (
+            "parse",
+            lambda: JSONParser().parse(io.BytesIO(content)),
+            lambda: FastJSONParser().parse(io.BytesIO(content)),
+        ),
+    ):
+        default_time = measure(default, args.number, args.repeat)
+        fast_time = measure(fast, args.number, args.repeat)
+        print(
+            f"{operation:<12}{default_time:>14.1f}{fast_time:>14.1f}"
+            f"{default_time / fast_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Helpers of the benchmarks: Django setup, measuring and reports."""
+
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(ROOT_DIR, "api_yamdb")
+
+
+def setup_django():
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api_yamdb.settings")
+    import django
+
+    django.setup()
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of the values."""
+    ordered = sorted(values)
+    index = max(0, int(round(percent / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+def measure(name, call, requests):
+    """Call 'call' the number of times, return stats of the scenario.
+
+    'call' makes one request and returns its response.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    latencies = []
+    queries = 0
+    errors = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as context:
+            request_start = time.perf_counter()
+            response = call()
+            latencies.append(time.perf_counter() - request_start)
+        queries += len(context)
+        if response.status_code >= 400:
+            errors += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "name": name,
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "throughput_rps": requests / elapsed,
+        "queries_per_request": queries / requests,
+    }
+
+
+METRICS = (
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "throughput_rps",
+    "queries_per_request",
+)
+
+
+def report(results, baseline=None):
+    """Print the results, with the change against baseline in percents."""
+    baseline = {result["name"]: result for result in baseline or ()}
+    header = f"{'scenario':<24}{'errors':>8}" + "".join(
+        f"{metric:>22}" for metric in METRICS
+    )
+    print(header)
+    for result in results:
+        line = f"{result['name']:<24}{result['errors']:>8}"
+        for metric in METRICS:
+            value = f"{result[metric]:.2f}"
+            if result["name"] in baseline:
+                old = baseline[result["name"]][metric]
+                change = (result[metric] - old) / old * 100 if old else 0
+                value += f" ({change:+.1f}%)"
+            line += f"{value:>22}"
+        print(line)
+
+
+def load(path):
+    with open(path, encoding="utf8") as file:
+        return json.load(file)
+
+
+def save(path, results):
+    with open(path, "w", encoding="utf8") as file:
+        json.dump(results, file, indent=2)
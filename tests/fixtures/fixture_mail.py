@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def email_outbox_eager(settings):
+    settings.EMAIL_OUTBOX_EAGER = True
@@ -0,0 +1,38 @@
+import pytest
+
+# Upper bound of database queries per route of GET request by an authenticated
+# user, independent of page size and amount of data.
+QUERY_BUDGETS = {
+    'categories-list': 2,
+    'genres-list': 2,
+    'titles-list': 4,
+    'titles-detail': 3,
+    'reviews-list': 3,
+    'reviews-detail': 2,
+    'comments-list': 3,
+    'comments-detail': 2,
+    'users-list': 2,
+}
+
+
+@pytest.fixture
+def query_budget():
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import resolve
+
+    def get(client, url):
+        route = resolve(url.split('?')[0]).url_name
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        queries = '\n'.join(query['sql'] for query in context.captured_queries)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET запрос `{url}` возвращает статус 200'
+        )
+        assert len(context) <= QUERY_BUDGETS[route], (
+            f'GET запрос `{url}` выполняет {len(context)} запросов к базе данных, '
+            f'а допустимо не больше {QUERY_BUDGETS[route]} для `{route}`:\n{queries}'
+        )
+        return response
+
+    return get
@@ -0,0 +1,55 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test08RatingAPI:
+
+    def get_rating(self, client, title_id):
+        return client.get(f'/api/v1/titles/{title_id}/').json().get('rating')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_review_changes(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        assert self.get_rating(admin_client, title_id) == 4, (
+            'Проверьте, что `rating` произведения пересчитывается при создании отзыва'
+        )
+        auth_client(user).patch(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/',
+            data={'score': 9}
+        )
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что `rating` произведения пересчитывается при изменении оценки отзыва'
+        )
+        admin_client.delete(f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/')
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что `rating` произведения пересчитывается при удалении отзыва'
+        )
+        admin_client.delete(f'/api/v1/users/{moderator.username}/')
+        assert self.get_rating(admin_client, title_id) == 9, (
+            'Проверьте, что `rating` произведения пересчитывается при каскадном удалении отзывов автора'
+        )
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Проверьте, что `rating` произведения без отзывов равен `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_recompute_ratings(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=0, rating_count=0, rating=None
+        )
+        call_command('recompute_ratings')
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (12, 3, 4), (
+            'Проверьте, что команда `recompute_ratings` восстанавливает рейтинг произведения'
+        )
+        assert Title.objects.get(pk=titles[1]['id']).rating is None, (
+            'Проверьте, что команда `recompute_ratings` не задаёт рейтинг произведению без отзывов'
+        )
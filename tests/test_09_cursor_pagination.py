@@ -0,0 +1,53 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test09CursorPaginationAPI:
+
+    def collect_pages(self, client, url):
+        results = []
+        while url:
+            data = client.get(url).json()
+            assert 'count' not in data, (
+                f'Проверьте, что при GET запросе `{url}` курсорная пагинация не считает `count`'
+            )
+            results.extend(data['results'])
+            url = data['next']
+        return results
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        results = self.collect_pages(client, '/api/v1/titles/?cursor=&page_size=1')
+        assert [title['id'] for title in results] == [
+            title['id'] for title in sorted(titles, key=lambda title: title['name'])
+        ], (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/?cursor=` '
+            'возвращает все произведения по порядку `name`, `id`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_cursor(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        results = self.collect_pages(
+            client, f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=&page_size=2'
+        )
+        assert [review['id'] for review in results] == [review['id'] for review in reviews], (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/{title_id}/reviews/?cursor=` '
+            'возвращает все отзывы по порядку `pub_date`, `id`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_page_size_capped(self, client, admin_client):
+        create_titles(admin_client)
+        from api.v1.pagination import TitleCursorPagination
+
+        TitleCursorPagination.max_page_size, max_page_size = 1, TitleCursorPagination.max_page_size
+        try:
+            data = client.get('/api/v1/titles/?cursor=&page_size=50').json()
+        finally:
+            TitleCursorPagination.max_page_size = max_page_size
+        assert len(data['results']) == 1, (
+            'Проверьте, что параметр `page_size` ограничен настройкой `MAX_PAGE_SIZE`'
+        )
@@ -0,0 +1,48 @@
+import pytest
+
+from .common import create_comments
+
+
+class Test10NestedResourcesAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_missing_parent(self, client, admin_client, admin):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        urls = (
+            '/api/v1/titles/999/reviews/',
+            f'/api/v1/titles/999/reviews/{reviews[0]["id"]}/comments/',
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/',
+        )
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == 404, (
+                f'Проверьте, что при GET запросе `{url}` '
+                'с не существующим родительским объектом возвращается статус 404'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_no_parent_lookup(self, client, admin_client, admin, django_assert_num_queries):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        with django_assert_num_queries(2):
+            client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        with django_assert_num_queries(2):
+            client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_duplicate_review(self, admin_client, admin):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        response = admin_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/', data={'text': 'Шляпа', 'score': 1}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что нельзя добавить второй отзыв на то же самое произведение'
+        )
+        assert response.json() == {
+            'non_field_errors': ['You can only leave one review for this creation.']
+        }, (
+            'Проверьте, что при повторном отзыве возвращается сообщение об ошибке валидации'
+        )
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['rating'] == 4, (
+            'Проверьте, что отклонённый отзыв не меняет `rating` произведения'
+        )
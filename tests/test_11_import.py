@@ -0,0 +1,116 @@
+import pytest
+from django.core.management import call_command
+
+
+class Test11ImportTestData:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_import_test_data(self):
+        from reviews.models import Category, Comment, Review, Title
+
+        call_command('import_test_data', '--batch-size', 10, verbosity=0)
+        assert (Title.objects.count(), Review.objects.count(), Comment.objects.count()) == (32, 72, 3), (
+            'Проверьте, что команда `import_test_data` загружает все строки из csv файлов'
+        )
+        assert Title.objects.filter(genre__isnull=False).distinct().count() == 32, (
+            'Проверьте, что команда `import_test_data` загружает связи произведений и жанров'
+        )
+        assert not Title.objects.filter(reviews__isnull=False, rating=None).exists(), (
+            'Проверьте, что после импорта `rating` произведений пересчитан'
+        )
+        category = Category.objects.create(name='Музыка', slug='music-new')
+        assert category.pk > 3, (
+            'Проверьте, что после импорта новые объекты создаются без конфликта первичных ключей'
+        )
+
+    def test_02_import_order(self):
+        from reviews.management.commands.import_test_data import IMPORT_MODELS, sort_models
+        from reviews.models import Category, Comment, Genre, Review, Title
+        from users.models import User
+
+        order = sort_models(IMPORT_MODELS)
+        for parent, child in (
+            (User, Review), (Review, Comment), (User, Comment), (Category, Title),
+            (Genre, Title.genre.through), (Title, Title.genre.through), (Title, Review),
+        ):
+            assert order.index(parent) < order.index(child), (
+                f'Проверьте, что таблица `{parent._meta.db_table}` загружается '
+                f'раньше таблицы `{child._meta.db_table}`'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('on_conflict', (True, False))
+    def test_03_upsert(self, monkeypatch, on_conflict):
+        from reviews.management.commands import import_test_data
+        from reviews.models import Comment, Review, Title
+
+        call_command('import_test_data', verbosity=0)
+        Title.objects.filter(pk=1).update(name='Изменено')
+        Review.objects.filter(pk=2).delete()
+        comment = Comment.objects.create(review_id=6, author_id=100, text='Новый комментарий')
+        monkeypatch.setattr(import_test_data, 'supports_on_conflict', lambda: on_conflict)
+        call_command('import_test_data', '--upsert', verbosity=0)
+        assert Title.objects.get(pk=1).name == 'Побег из Шоушенка', (
+            'Проверьте, что в режиме `--upsert` изменённые строки обновляются'
+        )
+        assert Review.objects.filter(pk=2).exists(), (
+            'Проверьте, что в режиме `--upsert` новые строки добавляются'
+        )
+        assert Comment.objects.filter(pk=comment.pk).exists(), (
+            'Проверьте, что в режиме `--upsert` существующие данные не удаляются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_parallel_order(self, monkeypatch):
+        import threading
+        import time
+
+        from reviews.management.commands import import_test_data
+
+        lock = threading.Lock()
+        started, finished, running, concurrency = [], [], set(), []
+
+        def fill_table(self, model, batch_size, upsert):
+            with lock:
+                started.append((model, set(finished)))
+                running.add(model)
+                concurrency.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.discard(model)
+                finished.append(model)
+
+        monkeypatch.setattr(import_test_data, 'fill_table_in_thread', fill_table)
+        import_test_data.fill_test_data_parallel(None, 10, workers=3)
+        dependencies = import_test_data.get_dependencies(import_test_data.IMPORT_MODELS)
+        assert sorted(finished, key=str) == sorted(import_test_data.IMPORT_MODELS, key=str), (
+            'Проверьте, что параллельный импорт загружает каждую таблицу один раз'
+        )
+        for model, finished_before in started:
+            assert dependencies[model] <= finished_before, (
+                f'Проверьте, что таблица `{model._meta.db_table}` загружается после таблиц, на которые ссылается'
+            )
+        assert 1 < max(concurrency) <= 3, (
+            'Проверьте, что независимые таблицы загружаются одновременно, не больше чем `--workers`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_parallel_failure(self, monkeypatch):
+        from django.core.management.base import CommandError
+
+        from reviews.management.commands import import_test_data
+        from reviews.models import Review, Title
+
+        started = []
+
+        def fill_table(self, model, batch_size, upsert):
+            started.append(model)
+            if model is Title:
+                raise ValueError('Ошибка загрузки')
+
+        monkeypatch.setattr(import_test_data, 'fill_table_in_thread', fill_table)
+        with pytest.raises(CommandError, match='reviews_title'):
+            import_test_data.fill_test_data_parallel(None, 10, workers=2)
+        assert Review not in started, (
+            'Проверьте, что после ошибки параллельный импорт не начинает зависимые таблицы'
+        )
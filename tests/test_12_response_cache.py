@@ -0,0 +1,52 @@
+import pytest
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test12ResponseCacheAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cache_and_invalidation(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(url)
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный анонимный GET запрос `{url}` берётся из кэша'
+        )
+        assert client.get('/api/v1/titles/?year=2000')['X-Cache'] == 'MISS', (
+            'Проверьте, что ключ кэша учитывает параметры запроса'
+        )
+
+        admin_client.patch(f'/api/v1/categories/{categories[0]["slug"]}/', data={})
+        admin_client.post('/api/v1/genres/', data={'name': 'Триллер', 'slug': 'thriller'})
+        assert client.get(url)['X-Cache'] == 'MISS', (
+            'Проверьте, что кэш произведений сбрасывается при изменении жанров'
+        )
+        admin_client.patch(url, data={'genre': [genres[2]['slug']]})
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS' and response.json()['genre'] == [genres[2]], (
+            'Проверьте, что кэш произведений сбрасывается при изменении произведения'
+        )
+
+        user, _ = create_users_api(admin_client)
+        auth_client(user).post(f'{url}reviews/', data={'text': 'Отзыв', 'score': 8})
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS' and response.json()['rating'] == 8, (
+            'Проверьте, что кэш произведений сбрасывается при добавлении отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cache_stats(self, client, admin_client, user_client):
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/')
+        assert user_client.get('/api/v1/cache/stats/').status_code == 403, (
+            'Проверьте, что статистика кэша доступна только администратору'
+        )
+        assert admin_client.get('/api/v1/cache/stats/').json() == {'hits': 1, 'misses': 1}, (
+            'Проверьте, что `/api/v1/cache/stats/` возвращает число попаданий и промахов кэша'
+        )
+        assert 'X-Cache' not in admin_client.get('/api/v1/genres/'), (
+            'Проверьте, что ответы аутентифицированным пользователям не кэшируются'
+        )
@@ -0,0 +1,96 @@
+import pytest
+
+from reviews.models import Category, Review
+
+from .common import create_reviews
+
+
+class Test13ConditionalGetAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_etag(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag.startswith('"') and 'Last-Modified' not in response, (
+            f'Проверьте, что GET запрос `{url}` возвращает заголовок `ETag` без `Last-Modified`'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304 and not response.content, (
+            f'Проверьте, что GET запрос `{url}` с актуальным `If-None-Match` возвращает статус 304'
+        )
+        assert client.get(f'{url}?cursor=', HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что `ETag` зависит от параметров страницы'
+        )
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'Новый текст'})
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что `ETag` меняется после изменения отзыва'
+        )
+        etag = client.get(url)['ETag']
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что `ETag` меняется после удаления отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_last_modified(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        last_modified = client.get(url)['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304, (
+            f'Проверьте, что GET запрос `{url}` с актуальным `If-Modified-Since` возвращает статус 304'
+        )
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT')
+        assert response.status_code == 200, (
+            f'Проверьте, что GET запрос `{url}` с устаревшим `If-Modified-Since` возвращает статус 200'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_renames(self, client, admin_client, admin, django_assert_num_queries):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        modified = Review.objects.get(pk=reviews[0]['id']).modified
+        admin_client.patch('/api/v1/users/me/', data={'username': 'renamed'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что `ETag` меняется после изменения имени автора отзыва'
+        )
+        assert Review.objects.get(pk=reviews[0]['id']).modified > modified, (
+            'Проверьте, что изменение имени автора обновляет дату изменения его отзывов'
+        )
+        url = '/api/v1/titles/'
+        etag = client.get(url)['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что закэшированный ответ проверяется без запросов к базе данных'
+        )
+        category = Category.objects.get(slug=titles[0]['category'])
+        category.name = 'Новое имя'
+        category.save()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что `ETag` меняется после изменения имени категории'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_not_modified_without_serialization(self, client, admin_client, admin, monkeypatch):
+        from api.v1.serializers import ReviewRowSerializer
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        calls = []
+        to_representation = ReviewRowSerializer.to_representation
+        monkeypatch.setattr(
+            ReviewRowSerializer, 'to_representation', lambda self, row: calls.append(row) or to_representation(self, row)
+        )
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304 and not calls, (
+            'Проверьте, что ответ 304 возвращается без сериализации строк'
+        )
+        Review.objects.filter(pk=reviews[2]['id']).delete()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что `ETag` меняется после удаления отзыва со страницы'
+        )
@@ -0,0 +1,37 @@
+import pytest
+
+
+class Test14JWTUserCacheAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_user_cached(self, user_client, django_assert_num_queries):
+        user_client.get('/api/v1/users/me/')
+        with django_assert_num_queries(1):
+            response = user_client.get('/api/v1/users/me/')
+        assert response.json()['email'] == 'testuser@yamdb.fake', (
+            'Проверьте, что при GET запросе `/api/v1/users/me/` '
+            'пользователь из кэша возвращает все поля'
+        )
+        with django_assert_num_queries(0):
+            response = user_client.get('/api/v1/users/')
+        assert response.status_code == 403, (
+            'Проверьте, что права пользователя из кэша проверяются без запросов к базе данных'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_user_invalidated(self, admin_client, user_client, user):
+        url = '/api/v1/users/'
+        assert user_client.get(url).status_code == 403
+        admin_client.patch(f'{url}{user.username}/', data={'role': 'admin'})
+        assert user_client.get(url).status_code == 200, (
+            'Проверьте, что изменение роли пользователя сразу учитывается при аутентификации'
+        )
+        user_client.patch(f'{url}me/', data={'role': 'user', 'bio': 'Новое био'})
+        response = user_client.get(f'{url}me/')
+        assert response.json()['bio'] == 'Новое био', (
+            'Проверьте, что PATCH запрос `/api/v1/users/me/` сохраняет изменения пользователя'
+        )
+        admin_client.delete(f'{url}{user.username}/')
+        assert user_client.get(f'{url}me/').status_code == 401, (
+            'Проверьте, что удалённый пользователь не проходит аутентификацию'
+        )
@@ -0,0 +1,113 @@
+import time
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+class Test15EmailOutbox:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_uses_outbox(self, client, settings):
+        from users.models import OutboundEmail
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        settings.EMAIL_OUTBOX_WORKERS = 0
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0 and OutboundEmail.objects.filter(
+            recipient=data['email'], sent__isnull=True
+        ).exists(), (
+            'Проверьте, что при POST запросе `/api/v1/auth/signup/` письмо попадает в очередь отправки'
+        )
+        call_command('send_emails', verbosity=0)
+        assert [message.to for message in mail.outbox] == [[data['email']]], (
+            'Проверьте, что команда `send_emails` отправляет письма из очереди'
+        )
+        assert not OutboundEmail.objects.filter(sent__isnull=True).exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_retry_failed(self, settings, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+        from users.mail import queue_email, send_pending
+        from users.models import OutboundEmail
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        settings.EMAIL_OUTBOX_WORKERS = 0
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        queue_email('Тема', 'Текст', 'valid@yamdb.fake')
+
+        def fail(self, messages):
+            raise ConnectionError('SMTP недоступен')
+
+        with monkeypatch.context() as patch:
+            patch.setattr(EmailBackend, 'send_messages', fail)
+            assert send_pending() == (0, 1)
+        email = OutboundEmail.objects.get()
+        assert (email.attempts, email.last_error) == (1, 'SMTP недоступен'), (
+            'Проверьте, что неудачная отправка письма сохраняет число попыток и ошибку'
+        )
+        assert send_pending() == (1, 0) and len(mail.outbox) == 1, (
+            'Проверьте, что неотправленное письмо отправляется повторно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_dispatcher(self, settings, admin_client):
+        from users.mail import MailDispatcher, queue_email
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        settings.EMAIL_OUTBOX_WORKERS = 0
+        for number in range(5):
+            queue_email('Тема', 'Текст', f'user{number}@yamdb.fake')
+        dispatcher = MailDispatcher(workers=1, batch_size=2, flush_interval=0.05)
+        dispatcher.start()
+        try:
+            dispatcher.notify()
+            deadline = time.monotonic() + 5
+            while len(mail.outbox) < 5 and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            dispatcher.stop()
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{number}@yamdb.fake' for number in range(5)
+        ], (
+            'Проверьте, что рабочие потоки отправляют каждое письмо из очереди ровно один раз'
+        )
+        stats = admin_client.get('/api/v1/mail/stats/').json()
+        assert stats['queue_depth'] == 0 and stats['sent'] >= 5, (
+            'Проверьте, что `/api/v1/mail/stats/` возвращает глубину очереди и число отправленных писем'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_send_outside_transaction(self, settings, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+        from django.db import connection
+        from users.mail import queue_email, send_pending
+        from users.models import OutboundEmail
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        settings.EMAIL_OUTBOX_WORKERS = 0
+        for number in range(3):
+            queue_email('Тема', 'Текст', f'user{number}@yamdb.fake')
+        send_messages = EmailBackend.send_messages
+        in_transaction = []
+
+        def send(self, messages):
+            in_transaction.append(connection.in_atomic_block)
+            if messages[0].to == ['user1@yamdb.fake']:
+                raise ConnectionError('Получатель недоступен')
+            return send_messages(self, messages)
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', send)
+        assert send_pending(batch_size=10) == (2, 1)
+        assert in_transaction and not any(in_transaction), (
+            'Проверьте, что письма отправляются вне транзакции базы данных'
+        )
+        assert sorted(OutboundEmail.objects.filter(sent__isnull=False).values_list('recipient', flat=True)) == [
+            'user0@yamdb.fake', 'user2@yamdb.fake'
+        ], (
+            'Проверьте, что ошибка отправки одного письма не отменяет отметки об отправке остальных'
+        )
+        email = OutboundEmail.objects.get(sent__isnull=True)
+        assert (email.attempts, email.last_error, email.claimed) == (1, 'Получатель недоступен', None)
@@ -0,0 +1,48 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test16MetricsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_metrics(self, client, admin_client, user_client):
+        from api.metrics import registry
+
+        create_titles(admin_client)
+        registry.clear()
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        response = admin_client.get('/api/v1/metrics/')
+        assert response.status_code == 200 and response['Content-Type'].startswith('text/plain'), (
+            'Проверьте, что `/api/v1/metrics/` возвращает метрики в текстовом формате Prometheus'
+        )
+        content = response.content.decode()
+        for line in (
+            '# TYPE api_request_duration_seconds histogram',
+            'api_request_duration_seconds_count{route="titles-list",method="GET"} 2',
+            'api_request_db_queries_bucket{route="titles-list",method="GET",le="+Inf"} 2',
+            'api_request_serialization_seconds_count{route="titles-list",method="GET"} 2',
+        ):
+            assert line in content.splitlines(), (
+                f'Проверьте, что `/api/v1/metrics/` содержит строку `{line}`'
+            )
+        assert 'api_request_db_queries_sum{route="titles-list",method="GET"} 0' not in content, (
+            'Проверьте, что метрики считают запросы к базе данных'
+        )
+        assert user_client.get('/api/v1/metrics/').status_code == 403, (
+            'Проверьте, что `/api/v1/metrics/` доступен только администратору'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bounded_labels(self, client):
+        from api.metrics import registry
+
+        registry.clear()
+        for number in range(5):
+            client.generic(f'FAKE{number}', '/api/v1/titles/')
+            client.generic(f'FAKE{number}', f'/unknown-{number}/')
+        labels = {key[1:] for key in registry._histograms}
+        assert labels <= {('titles-list', 'other'), ('unmatched', 'other')}, (
+            'Проверьте, что метки метрик не растут от методов и адресов запросов клиентов'
+        )
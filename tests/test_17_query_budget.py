@@ -0,0 +1,57 @@
+import pytest
+
+
+def create_dataset(size):
+    from django.contrib.auth import get_user_model
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    users = [
+        get_user_model().objects.create(username=f'user{number}', email=f'user{number}@yamdb.fake')
+        for number in range(size)
+    ]
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name=f'Жанр {number}', slug=f'genre{number}') for number in range(size)
+    ]
+    titles = [
+        Title.objects.create(name=f'Произведение {number}', year=2000, category=category)
+        for number in range(size)
+    ]
+    for title in titles:
+        title.genre.set(genres)
+    title = titles[0]
+    reviews = [
+        Review.objects.create(title=title, author=user, text='Отзыв', score=5) for user in users
+    ]
+    for user in users:
+        Comment.objects.create(review=reviews[0], author=user, text='Комментарий')
+    return title, reviews[0]
+
+
+class Test17QueryBudget:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('size', (3, 12))
+    def test_01_query_budget(self, admin_client, query_budget, size):
+        title, review = create_dataset(size)
+        admin_client.get('/api/v1/users/me/')
+        for url in (
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title.id}/',
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            '/api/v1/users/',
+        ):
+            query_budget(admin_client, url)
+        comment_id = review.comments.first().id
+        query_budget(admin_client, f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/{comment_id}/')
+        for page_size in (2, 10):
+            for url in (
+                '/api/v1/titles/',
+                f'/api/v1/titles/{title.id}/reviews/',
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            ):
+                query_budget(admin_client, f'{url}?cursor=&page_size={page_size}')
@@ -0,0 +1,140 @@
+import pytest
+from django.db import connection
+
+from reviews.search import REVIEW_INDEX, TITLE_INDEX
+
+from .common import create_comments, create_reviews, create_titles
+
+
+def search(client, query, **filters):
+    response = client.get('/api/v1/titles/', {'search': query, **filters})
+    assert response.status_code == 200, (
+        'Проверьте, что GET запрос `/api/v1/titles/?search=` возвращает статус 200'
+    )
+    return [title['id'] for title in response.json()['results']]
+
+
+class Test18SearchAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert search(client, 'пов') == [titles[0]['id']], (
+            'Проверьте, что поиск произведений находит слова по началу'
+        )
+        assert search(client, 'драма года') == [titles[1]['id']], (
+            'Проверьте, что поиск произведений ищет по описанию'
+        )
+        assert search(client, 'драма пике') == [], (
+            'Проверьте, что поиск произведений находит только совпадения со всеми словами'
+        )
+        assert search(client, '"*') == [], (
+            'Проверьте, что поиск произведений без слов ничего не находит'
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        admin_client.patch(url, data={'name': 'Разворот'})
+        assert search(client, 'разворот') == [titles[0]['id']] and search(client, 'поворот') == [], (
+            'Проверьте, что поиск произведений учитывает изменение названия'
+        )
+        admin_client.delete(url)
+        assert search(client, 'разворот') == [], (
+            'Проверьте, что поиск произведений не находит удалённые произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_search_rank(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        data = {'name': 'Проект проект проект', 'year': 2001, 'genre': [genres[0]['slug']],
+                'category': categories[0]['slug']}
+        best = admin_client.post('/api/v1/titles/', data=data).json()['id']
+        assert search(client, 'проект') == [best, titles[1]['id']], (
+            'Проверьте, что поиск произведений упорядочивает результаты по релевантности'
+        )
+        assert search(client, 'проект', category=categories[1]['slug']) == [titles[1]['id']], (
+            'Проверьте, что поиск произведений работает вместе с фильтрами'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_title_search_fallback(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        TITLE_INDEX.uninstall(connection)
+        try:
+            assert search(client, 'драма') == [titles[1]['id']], (
+                'Проверьте, что без полнотекстового индекса поиск работает через `icontains`'
+            )
+        finally:
+            TITLE_INDEX.install(connection)
+        assert search(client, 'пов') == [titles[0]['id']], (
+            'Проверьте, что полнотекстовый индекс заполняется существующими произведениями'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_review_search(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/'
+        admin_client.patch(url, data={'text': 'Сюжет хорош, но финал слабый'})
+        response = client.get('/api/v1/search/reviews/', {'q': 'финал'})
+        assert response.status_code == 200, (
+            'Проверьте, что GET запрос `/api/v1/search/reviews/` доступен без токена'
+        )
+        results = response.json()['results']
+        assert [review['id'] for review in results] == [reviews[1]['id']], (
+            'Проверьте, что поиск отзывов находит отзывы по тексту'
+        )
+        assert '<mark>финал</mark>' in results[0]['snippet'] and results[0]['title'] == titles[0]['id'], (
+            'Проверьте, что поиск отзывов возвращает фрагмент текста с выделенными словами'
+        )
+        response = client.get('/api/v1/search/reviews/', {'q': 'qwerty', 'title': titles[1]['id']})
+        assert response.json()['count'] == 0, (
+            'Проверьте, что поиск отзывов ограничивается произведением из параметра `title`'
+        )
+        response = client.get('/api/v1/search/reviews/', {'q': 'qwer', 'title': titles[0]['id']})
+        assert response.json()['count'] == 2, (
+            'Проверьте, что поиск отзывов находит слова по началу'
+        )
+        assert client.get('/api/v1/search/reviews/').status_code == 400, (
+            'Проверьте, что GET запрос `/api/v1/search/reviews/` без параметра `q` возвращает статус 400'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_comment_search(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        response = client.get('/api/v1/search/comments/', {'q': 'qwerty321', 'title': titles[0]['id']})
+        results = response.json()['results']
+        assert [comment['id'] for comment in results] == [comments[2]['id']], (
+            'Проверьте, что поиск комментариев находит комментарии по тексту'
+        )
+        assert results[0]['review'] == reviews[0]['id'] and results[0]['snippet'] == '<mark>qwerty321</mark>', (
+            'Проверьте, что поиск комментариев возвращает отзыв и фрагмент текста'
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/{comments[2]["id"]}/'
+        admin_client.delete(url)
+        response = client.get('/api/v1/search/comments/', {'q': 'qwerty321'})
+        assert response.json()['count'] == 0, (
+            'Проверьте, что поиск комментариев не находит удалённые комментарии'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_snippet_escaped(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/'
+        admin_client.patch(url, data={'text': '<img src=x onerror=alert(1)> plot twist'})
+        expected = '&lt;img src=x onerror=alert(1)&gt; <mark>plot</mark> twist'
+        response = client.get('/api/v1/search/reviews/', {'q': 'plot'})
+        assert response.json()['results'][0]['snippet'] == expected, (
+            'Проверьте, что фрагмент текста экранирует HTML из текста отзыва'
+        )
+        REVIEW_INDEX.uninstall(connection)
+        try:
+            response = client.get('/api/v1/search/reviews/', {'q': 'plot'})
+        finally:
+            REVIEW_INDEX.install(connection)
+        assert response.json()['results'][0]['snippet'] == expected, (
+            'Проверьте, что без полнотекстового индекса фрагмент текста тоже выделяет найденные слова'
+        )
+        long_text = ' '.join(f'слово{number}' for number in range(40)) + ' финал'
+        admin_client.patch(url, data={'text': long_text})
+        snippet = client.get('/api/v1/search/reviews/', {'q': 'финал'}).json()['results'][0]['snippet']
+        assert snippet.startswith('…') and snippet.endswith('<mark>финал</mark>'), (
+            'Проверьте, что фрагмент длинного текста содержит найденное слово'
+        )
@@ -0,0 +1,66 @@
+import pytest
+
+from .common import create_reviews
+
+
+def get_ids(client, query):
+    response = client.get(f'/api/v1/titles/?{query}')
+    assert response.status_code == 200, (
+        f'Проверьте, что GET запрос `/api/v1/titles/?{query}` возвращает статус 200'
+    )
+    return [title['id'] for title in response.json()['results']]
+
+
+class Test19TitleFiltersAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_genre_filter(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        assert get_ids(admin_client, 'genre=horror,comedy') == [first], (
+            'Проверьте, что фильтр по нескольким жанрам не повторяет произведения'
+        )
+        assert sorted(get_ids(admin_client, 'genre=horror,drama')) == sorted([first, second]), (
+            'Проверьте, что фильтр по нескольким жанрам находит произведения с любым из них'
+        )
+        assert get_ids(admin_client, 'genre=horror,comedy&genre_match=all') == [first], (
+            'Проверьте, что фильтр `genre_match=all` находит произведения со всеми жанрами'
+        )
+        assert get_ids(admin_client, 'genre=horror,drama&genre_match=all') == [], (
+            'Проверьте, что фильтр `genre_match=all` не находит произведения без одного из жанров'
+        )
+        response = admin_client.get('/api/v1/titles/?genre_match=some')
+        assert response.status_code == 400, (
+            'Проверьте, что неверное значение `genre_match` возвращает статус 400'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_range_filters(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        assert get_ids(admin_client, 'year_min=2001') == [second], (
+            'Проверьте фильтр `year_min`'
+        )
+        assert get_ids(admin_client, 'year_min=2000&year_max=2019') == [first], (
+            'Проверьте фильтры `year_min` и `year_max`'
+        )
+        assert get_ids(admin_client, 'rating_min=4&rating_max=4') == [first], (
+            'Проверьте фильтры `rating_min` и `rating_max`'
+        )
+        assert get_ids(admin_client, 'rating_min=5') == [], (
+            'Проверьте, что фильтр `rating_min` не находит произведения с меньшим рейтингом'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_ordering(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        assert get_ids(admin_client, 'ordering=-year') == [second, first], (
+            'Проверьте сортировку произведений по году'
+        )
+        assert get_ids(admin_client, 'ordering=name') == [first, second], (
+            'Проверьте сортировку произведений по названию'
+        )
+        assert get_ids(admin_client, 'ordering=rating&rating_min=1') == [first], (
+            'Проверьте сортировку произведений по рейтингу'
+        )
@@ -0,0 +1,71 @@
+import datetime
+import io
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api.v1 import renderers
+from api.v1.parsers import FastJSONParser
+from api.v1.renderers import FastJSONRenderer
+
+DATA = {
+    'pub_date': datetime.datetime(2022, 12, 20, 20, 11, 5, 123456, tzinfo=timezone.utc),
+    'naive': datetime.datetime(2022, 12, 20, 20, 11),
+    'day': datetime.date(2022, 12, 20),
+    'price': Decimal('9.90'),
+    'lazy': gettext_lazy('Rating'),
+    'text': 'Текст с разделителем',
+    'genre': [{'name': 'Драма', 'slug': 'drama'}],
+    1: None,
+}
+
+
+class Test20JSONAPI:
+
+    @pytest.mark.parametrize('available', (True, False))
+    def test_01_renderer(self, monkeypatch, available):
+        if not available:
+            monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA), (
+            'Проверьте, что `FastJSONRenderer` выводит то же, что и `JSONRenderer`'
+        )
+        media_type = 'application/json; indent=4'
+        assert FastJSONRenderer().render(DATA, media_type) == JSONRenderer().render(DATA, media_type), (
+            'Проверьте, что `FastJSONRenderer` поддерживает отступы'
+        )
+        assert FastJSONRenderer().render(None) == b'', (
+            'Проверьте, что `FastJSONRenderer` выводит пустой ответ для `None`'
+        )
+
+    @pytest.mark.parametrize('available', (True, False))
+    def test_02_parser(self, monkeypatch, available):
+        calls = []
+        if available:
+            pytest.importorskip('orjson')
+            loads = renderers.orjson.loads
+            monkeypatch.setattr(renderers.orjson, 'loads', lambda data: calls.append(data) or loads(data))
+        else:
+            monkeypatch.setattr(renderers, 'orjson', None)
+        content = '{"text": "Текст", "score": 5}'.encode()
+        assert FastJSONParser().parse(io.BytesIO(content)) == {'text': 'Текст', 'score': 5}, (
+            'Проверьте, что `FastJSONParser` разбирает JSON'
+        )
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"score": NaN}'))
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"score":'))
+        assert bool(calls) == available, (
+            'Проверьте, что `FastJSONParser` использует `orjson` только когда он доступен'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_json_request(self, admin_client):
+        data = {'name': 'Фэнтези', 'slug': 'fantasy'}
+        response = admin_client.post('/api/v1/genres/', data=data, format='json')
+        assert response.status_code == 201 and response.json() == data, (
+            'Проверьте, что POST запрос с JSON создаёт жанр'
+        )
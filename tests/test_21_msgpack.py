@@ -0,0 +1,102 @@
+import msgpack
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+
+from users.models import User
+
+from .common import create_comments
+
+MSGPACK = 'application/msgpack'
+
+
+def post(client, url, data, method='post'):
+    response = getattr(client, method)(url, data=msgpack.packb(data), content_type=MSGPACK, HTTP_ACCEPT=MSGPACK)
+    assert response['Content-Type'] == MSGPACK, (
+        f'Проверьте, что запрос `{url}` с `Accept: {MSGPACK}` возвращает MessagePack'
+    )
+    return response.status_code, msgpack.unpackb(response.content)
+
+
+class Test21MessagePackAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_read_round_trip(self, client, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(admin_client, admin)
+        review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comment_url = f'{review_url}{reviews[0]["id"]}/comments/'
+        for url in (
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            review_url,
+            f'{review_url}{reviews[0]["id"]}/',
+            comment_url,
+            f'{comment_url}{comments[0]["id"]}/',
+            '/api/v1/users/',
+            f'/api/v1/users/{user.username}/',
+            '/api/v1/users/me/',
+            '/api/v1/search/reviews/?q=qwerty',
+            '/api/v1/search/comments/?q=qwerty',
+        ):
+            response = admin_client.get(url, HTTP_ACCEPT=MSGPACK)
+            assert response.status_code == 200 and response['Content-Type'] == MSGPACK, (
+                f'Проверьте, что GET запрос `{url}` с `Accept: {MSGPACK}` возвращает MessagePack'
+            )
+            assert msgpack.unpackb(response.content) == admin_client.get(url).json(), (
+                f'Проверьте, что GET запрос `{url}` возвращает в MessagePack те же данные, что и в JSON'
+            )
+        response = client.get('/api/v1/titles/?format=msgpack')
+        assert response['Content-Type'] == MSGPACK, (
+            'Проверьте, что формат ответа можно выбрать параметром `format=msgpack`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_write_round_trip(self, client, admin_client, admin):
+        data = {'name': 'Фэнтези', 'slug': 'fantasy'}
+        assert post(admin_client, '/api/v1/genres/', data) == (201, data), (
+            'Проверьте, что POST запрос в MessagePack создаёт жанр'
+        )
+        data = {'name': 'Сериал', 'slug': 'series'}
+        assert post(admin_client, '/api/v1/categories/', data) == (201, data), (
+            'Проверьте, что POST запрос в MessagePack создаёт категорию'
+        )
+        data = {'name': 'Ведьмак', 'year': 2019, 'genre': ['fantasy'], 'category': 'series', 'description': None}
+        status, title = post(admin_client, '/api/v1/titles/', data)
+        assert status == 201 and title == {'id': title['id'], **data}, (
+            'Проверьте, что POST запрос в MessagePack создаёт произведение'
+        )
+        status, review = post(admin_client, f'/api/v1/titles/{title["id"]}/reviews/', {'text': 'Хорошо', 'score': 8})
+        assert status == 201 and (review['text'], review['score'], review['author']) == ('Хорошо', 8, admin.username), (
+            'Проверьте, что POST запрос в MessagePack создаёт отзыв'
+        )
+        url = f'/api/v1/titles/{title["id"]}/reviews/{review["id"]}/comments/'
+        status, comment = post(admin_client, url, {'text': 'Согласен'})
+        assert status == 201 and comment['text'] == 'Согласен', (
+            'Проверьте, что POST запрос в MessagePack создаёт комментарий'
+        )
+        data = {'username': 'geralt', 'email': 'geralt@yamdb.fake', 'role': 'moderator'}
+        status, user = post(admin_client, '/api/v1/users/', data)
+        assert status == 201 and {key: user[key] for key in data} == data, (
+            'Проверьте, что POST запрос в MessagePack создаёт пользователя'
+        )
+        status, me = post(admin_client, '/api/v1/users/me/', {'bio': 'Новое био'}, method='patch')
+        assert status == 200 and me['bio'] == 'Новое био', (
+            'Проверьте, что PATCH запрос в MessagePack изменяет пользователя'
+        )
+        data = {'username': 'ciri', 'email': 'ciri@yamdb.fake'}
+        assert post(client, '/api/v1/auth/signup/', data) == (200, data), (
+            'Проверьте, что регистрация принимает и возвращает MessagePack'
+        )
+        code = default_token_generator.make_token(User.objects.get(username='ciri'))
+        status, token = post(client, '/api/v1/auth/token/', {'username': 'ciri', 'confirmation_code': code})
+        assert status == 200 and 'token' in token, (
+            'Проверьте, что получение токена принимает и возвращает MessagePack'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_parse_error(self, admin_client):
+        response = admin_client.post('/api/v1/genres/', data=b'\xc1', content_type=MSGPACK)
+        assert response.status_code == 400, (
+            'Проверьте, что POST запрос с неверным MessagePack возвращает статус 400'
+        )
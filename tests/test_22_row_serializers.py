@@ -0,0 +1,52 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.v1 import serializers
+from api.v1.serializers import CommentSerializer, ReviewSerializer, TitleSerializerRead
+from reviews.models import Comment, Review, Title
+
+from .common import create_comments
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+class Test22RowSerializersAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_same_output(self, admin_client, admin):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        Title.objects.create(name='Без жанра и категории', year=1999)
+        expected = {
+            '/api/v1/titles/': TitleSerializerRead(Title.objects.order_by('name'), many=True).data,
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/': ReviewSerializer(
+                Review.objects.filter(title_id=titles[0]['id']), many=True
+            ).data,
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/': CommentSerializer(
+                Comment.objects.filter(review_id=reviews[0]['id']), many=True
+            ).data,
+        }
+        for url, data in expected.items():
+            response = admin_client.get(url)
+            assert response.status_code == 200 and render(response.data['results']) == render(data), (
+                f'Проверьте, что GET запрос `{url}` возвращает то же, что и сериализатор модели'
+            )
+        assert response.data['results'][0]['pub_date'].endswith('Z'), (
+            'Проверьте формат даты публикации'
+        )
+        results = admin_client.get('/api/v1/titles/').json()['results']
+        assert {(title['category'] is None, title['genre'] == []) for title in results} == {(True, True), (False, False)}, (
+            'Проверьте вывод произведений без категории и жанров'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_genres_aggregation(self, admin_client, admin, monkeypatch):
+        create_comments(admin_client, admin)
+        Title.objects.create(name='Без жанра и категории', year=1999)
+        aggregated = admin_client.get('/api/v1/titles/')
+        monkeypatch.setattr(serializers, 'GENRES_JSON_SQL', {})
+        fetched = admin_client.get('/api/v1/titles/')
+        assert aggregated.content == fetched.content, (
+            'Проверьте, что жанры, собранные базой данных, совпадают с жанрами из отдельного запроса'
+        )
@@ -0,0 +1,144 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test23BulkCreateAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_genres_bulk(self, client, admin_client, user_client):
+        admin_client.post('/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'})
+        client.get('/api/v1/genres/')
+        data = [
+            {'name': 'Ужасы', 'slug': 'horror'},
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Ужасы 2', 'slug': 'horror'},
+            {'name': 'Комедия', 'slug': 'не слаг'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ]
+        assert user_client.post('/api/v1/genres/bulk/', data=data, format='json').status_code == 403, (
+            'Проверьте, что пакетное создание жанров доступно только администратору'
+        )
+        response = admin_client.post('/api/v1/genres/bulk/', data=data, format='json')
+        assert response.status_code == 207, (
+            'Проверьте, что пакетное создание с ошибками в части элементов возвращает статус 207'
+        )
+        result = response.json()
+        assert result['created'] == [data[0], data[4]], (
+            'Проверьте, что пакетное создание создаёт верные элементы'
+        )
+        assert [error['index'] for error in result['errors']] == [1, 2, 3], (
+            'Проверьте, что пакетное создание возвращает ошибки с индексами элементов'
+        )
+        assert all('slug' in error['errors'] for error in result['errors']), (
+            'Проверьте, что пакетное создание проверяет уникальность и формат `slug`'
+        )
+        assert client.get('/api/v1/genres/').json()['count'] == 3, (
+            'Проверьте, что пакетное создание сбрасывает кэш списка жанров'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_categories_bulk(self, admin_client, settings):
+        data = [{'name': f'Категория {number}', 'slug': f'category-{number}'} for number in range(3)]
+        response = admin_client.post('/api/v1/categories/bulk/', data=data, format='json')
+        assert response.status_code == 201 and response.json() == {'created': data, 'errors': []}, (
+            'Проверьте, что пакетное создание без ошибок возвращает статус 201 и созданные элементы'
+        )
+        response = admin_client.post('/api/v1/categories/bulk/', data=data, format='json')
+        assert response.status_code == 400 and response.json()['created'] == [], (
+            'Проверьте, что пакетное создание без верных элементов возвращает статус 400'
+        )
+        settings.BULK_CREATE_MAX_ITEMS = 2
+        response = admin_client.post('/api/v1/categories/bulk/', data=data, format='json')
+        assert response.status_code == 400, (
+            'Проверьте, что пакетное создание ограничивает число элементов'
+        )
+        for data in ({'name': 'Категория', 'slug': 'category'}, []):
+            response = admin_client.post('/api/v1/categories/bulk/', data=data, format='json')
+            assert response.status_code == 400, (
+                'Проверьте, что пакетное создание принимает только непустой список'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_titles_bulk(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+
+        def get_items(count):
+            return [
+                {'name': f'Произведение {number}', 'year': 2000 + number, 'description': 'Описание',
+                 'genre': [genres[number % 3]['slug'], genres[(number + 1) % 3]['slug']],
+                 'category': categories[number % 2]['slug']}
+                for number in range(count)
+            ]
+
+        data = get_items(2) + [
+            {'name': 'Без жанра', 'year': 2000, 'genre': ['unknown', 'missing'], 'category': 'unknown'},
+            {'name': 'Из будущего', 'year': 3000, 'genre': [genres[0]['slug']], 'category': categories[0]['slug']},
+        ]
+        response = admin_client.post('/api/v1/titles/bulk/', data=data, format='json')
+        assert response.status_code == 207, (
+            'Проверьте, что пакетное создание произведений с ошибками возвращает статус 207'
+        )
+        result = response.json()
+        assert [{key: title[key] for key in data[0]} for title in result['created']] == data[:2], (
+            'Проверьте, что пакетное создание возвращает созданные произведения'
+        )
+        errors = {error['index']: error['errors'] for error in result['errors']}
+        assert set(errors) == {2, 3} and len(errors[2]['genre']) == 2 and 'category' in errors[2], (
+            'Проверьте, что пакетное создание сообщает обо всех неизвестных жанрах и категориях'
+        )
+        assert 'year' in errors[3], (
+            'Проверьте, что пакетное создание проверяет год выпуска'
+        )
+        for title in result['created']:
+            response = admin_client.get(f'/api/v1/titles/{title["id"]}/')
+            assert [genre['slug'] for genre in response.json()['genre']] == sorted(
+                title['genre'], key=lambda slug: next(genre['name'] for genre in genres if genre['slug'] == slug)
+            ), (
+                'Проверьте, что пакетное создание сохраняет жанры произведений'
+            )
+        queries = []
+        for count in (2, 20):
+            items = [{**item, 'name': f'{item["name"]} из {count}'} for item in get_items(count)]
+            with CaptureQueriesContext(connection) as context:
+                assert admin_client.post('/api/v1/titles/bulk/', data=items, format='json').status_code == 201
+            queries.append(len(context))
+        assert queries[0] == queries[1], (
+            'Проверьте, что число запросов пакетного создания не зависит от числа элементов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_titles_bulk_without_returning(self, admin_client, monkeypatch):
+        _, categories, genres = create_titles(admin_client)
+        monkeypatch.setattr(connection, 'vendor', 'mysql')
+        data = [
+            {'name': f'Произведение {number}', 'year': 2000, 'genre': [genres[number]['slug']],
+             'category': categories[0]['slug']}
+            for number in range(3)
+        ]
+        response = admin_client.post('/api/v1/titles/bulk/', data=data, format='json')
+        assert response.status_code == 201, (
+            'Проверьте, что пакетное создание работает на базах данных без возврата id'
+        )
+        for title, item in zip(response.json()['created'], data):
+            response = admin_client.get(f'/api/v1/titles/{title["id"]}/')
+            assert response.json()['name'] == item['name'] and [
+                genre['slug'] for genre in response.json()['genre']
+            ] == item['genre'], (
+                'Проверьте, что без возврата id жанры привязываются к своим произведениям'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_reserved_slug(self, admin_client):
+        for resource in ('categories', 'genres'):
+            data = {'name': 'Пакет', 'slug': 'bulk'}
+            response = admin_client.post(f'/api/v1/{resource}/', data=data)
+            assert response.status_code == 400 and 'slug' in response.json(), (
+                f'Проверьте, что `slug` `bulk` занят адресом `/api/v1/{resource}/bulk/` и запрещён'
+            )
+            response = admin_client.post(f'/api/v1/{resource}/bulk/', data=[data], format='json')
+            assert response.status_code == 400 and 'slug' in response.json()['errors'][0]['errors'], (
+                'Проверьте, что пакетное создание тоже запрещает `slug` `bulk`'
+            )
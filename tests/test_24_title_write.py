@@ -0,0 +1,40 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test24TitleWriteAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_genre_slugs_by_one_query(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        queries = []
+        for count in (1, 3):
+            data = {'name': f'Произведение {count}', 'year': 2000, 'category': categories[0]['slug'],
+                    'genre': [genre['slug'] for genre in genres[:count]]}
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post('/api/v1/titles/', data=data)
+            assert response.status_code == 201 and sorted(response.json()['genre']) == sorted(data['genre']), (
+                'Проверьте, что POST запрос `/api/v1/titles/` создаёт произведение с жанрами'
+            )
+            queries.append(len(context))
+        assert queries[0] == queries[1], (
+            'Проверьте, что число запросов при создании произведения не зависит от числа жанров'
+        )
+        title_id = response.json()['id']
+        response = admin_client.patch(f'/api/v1/titles/{title_id}/', data={'genre': [genres[2]['slug']]})
+        assert response.status_code == 200 and response.json()['genre'] == [genres[2]['slug']], (
+            'Проверьте, что PATCH запрос `/api/v1/titles/{title_id}/` изменяет жанры произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_unknown_genres(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        data = {'name': 'Произведение', 'year': 2000, 'category': categories[0]['slug'],
+                'genre': [genres[0]['slug'], 'unknown', 'missing']}
+        response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == 400 and len(response.json()['genre']) == 2, (
+            'Проверьте, что POST запрос `/api/v1/titles/` сообщает обо всех неизвестных жанрах сразу'
+        )
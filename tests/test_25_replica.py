@@ -0,0 +1,71 @@
+import pytest
+from django.core.cache import caches
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+@pytest.fixture
+def replica(settings):
+    # The replica shares the in-memory test database with 'default'.
+    connections.databases['replica'] = dict(connections.databases['default'])
+    settings.DATABASE_REPLICAS = ['replica']
+    yield connections['replica']
+    connections['replica'].close()
+    del connections.databases['replica']
+    del connections['replica']
+
+
+class Test25ReplicaAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_safe_requests_read_replica(self, admin_client, replica, settings):
+        titles, _, _ = create_titles(admin_client)
+        caches[settings.REPLICA_PIN_CACHE].clear()
+        with CaptureQueriesContext(connections['default']) as default, \
+                CaptureQueriesContext(replica) as context:
+            response = admin_client.get('/api/v1/genres/')
+        assert response.status_code == 200 and len(context), (
+            'Проверьте, что GET запросы к ресурсам читают данные с реплики'
+        )
+        assert all('users_user' in query['sql'] for query in default.captured_queries), (
+            'Проверьте, что с основной базы читается только пользователь JWT'
+        )
+        with CaptureQueriesContext(replica) as context:
+            response = admin_client.post(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/', data={'text': 'Отзыв', 'score': 5}
+            )
+        assert response.status_code == 201 and not len(context), (
+            'Проверьте, что POST запросы выполняются на основной базе данных'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reads_pinned_after_write(self, admin_client, user_client, replica, settings):
+        titles, _, _ = create_titles(admin_client)
+        caches[settings.REPLICA_PIN_CACHE].clear()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 201
+        with CaptureQueriesContext(replica) as context:
+            response = user_client.get(url)
+        assert response.status_code == 200 and not len(context), (
+            'Проверьте, что после записи чтения пользователя идут в основную базу данных'
+        )
+        with CaptureQueriesContext(replica) as context:
+            response = admin_client.get('/api/v1/categories/')
+        assert response.status_code == 200 and len(context), (
+            'Проверьте, что закрепление за основной базой действует только для автора записи'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_user_snapshot_from_primary(self, user_client, user, replica, settings):
+        caches[settings.JWT_USER_CACHE].clear()
+        with CaptureQueriesContext(replica) as context:
+            response = user_client.get('/api/v1/genres/')
+        assert response.status_code == 200 and len(context), (
+            'Проверьте, что GET запросы к ресурсам читают данные с реплики'
+        )
+        assert not any('users_user' in query['sql'] for query in context.captured_queries), (
+            'Проверьте, что пользователь JWT читается из основной базы данных, а не с реплики'
+        )
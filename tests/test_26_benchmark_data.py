@@ -0,0 +1,25 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+
+class Test26BenchmarkData:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_totals(self):
+        from reviews.models import Comment, Review, Title
+        from users.models import User
+
+        call_command(
+            'generate_benchmark_data', '--clear', '--users', 5, '--titles', 30, '--reviews', 100,
+            '--comments', 2000, stdout=io.StringIO()
+        )
+        assert (User.objects.count(), Title.objects.count()) == (5, 30)
+        assert (Review.objects.count(), Comment.objects.count()) == (100, 2000), (
+            'Проверьте, что `generate_benchmark_data` создаёт ровно заданное число отзывов и комментариев'
+        )
+        counts = list(Title.objects.order_by('id').values_list('rating_count', flat=True))
+        assert max(counts) == 5 and counts[0] >= counts[-1], (
+            'Проверьте, что отзывы распределены по закону Ципфа без повторных авторов'
+        )